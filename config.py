@@ -27,6 +27,8 @@ class Settings(BaseSettings):
     LLM_MAX_RETRIES: int = 3
     LLM_RETRY_DELAY: float = 2.0  # seconds
     LLM_TIMEOUT: float = 60.0  # seconds
+    LLM_MAX_CONCURRENCY: int = 8  # Parallel per-sheet LLM calls within a stage
+    LLM_CACHE_ENABLED: bool = True  # Reuse archaeology/analysis responses from OUTPUT_DIR/cache
 
     # Audio transcription (Stage 0 for audio uploads)
     AUDIO_TRANSCRIPTION_MODEL: str = "whisper-1"
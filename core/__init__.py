@@ -22,6 +22,7 @@ __all__ = [
     "PostgresColumn",
     "PostgresTable",
     "ValidationIssue",
+    "ValidationIssuesFrame",
     "ETLResult",
     "Evidence",
     "NarrativeEvidence",
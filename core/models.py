@@ -1,6 +1,7 @@
 """Core data models for Tragaldabas pipeline"""
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, Any, Dict, List, Union, Literal
 from datetime import datetime
 from .enums import (
@@ -178,15 +179,71 @@ class ValidationIssue(BaseModel):
     message: str
 
 
+class ValidationIssuesFrame:
+    """
+    Validation failures stored column-wise
+    
+    Dirty datasets can produce one issue per cell, so issues are kept as
+    parallel arrays (row labels plus codes into small tables of column
+    names and issue kinds) and ValidationIssue objects are only built when
+    iterated or indexed.
+    """
+    
+    def __init__(
+        self,
+        rows: Optional[np.ndarray] = None,
+        column_codes: Optional[np.ndarray] = None,
+        columns: Optional[List[str]] = None,
+        values: Optional[np.ndarray] = None,
+        kind_codes: Optional[np.ndarray] = None,
+        kinds: Optional[List[tuple[ValidationIssueType, str]]] = None,
+    ):
+        self.rows = rows if rows is not None else np.empty(0, dtype=np.int64)
+        self.column_codes = column_codes if column_codes is not None else np.empty(0, dtype=np.int32)
+        self.columns = columns or []
+        self.values = values if values is not None else np.empty(0, dtype=object)
+        self.kind_codes = kind_codes if kind_codes is not None else np.empty(0, dtype=np.int8)
+        # (issue type, message) pairs shared by every issue of that kind
+        self.kinds = kinds or []
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def __getitem__(self, index: int) -> ValidationIssue:
+        issue_type, message = self.kinds[self.kind_codes[index]]
+        return ValidationIssue(
+            row_number=int(self.rows[index]),
+            column=self.columns[self.column_codes[index]],
+            value=self.values[index],
+            issue_type=issue_type,
+            message=message
+        )
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
 class ETLResult(BaseModel):
     """Complete Stage 5 output"""
     table_schema: PostgresTable  # Renamed from 'schema' to avoid shadowing BaseModel.schema
     schema_sql: str = ""
     data_file_path: str = ""
     load_sql: str = ""
-    validation_issues: list[ValidationIssue] = []
     rows_valid: int = 0
     rows_invalid: int = 0
+    # Column-wise validation failures; see validation_issues
+    issues_frame: Any = Field(default=None, exclude=True)  # ValidationIssuesFrame
+    # In-memory copy of the data file for later stages; not serialized
+    dataframe: Any = Field(default=None, exclude=True)  # DataFrame
+    
+    @computed_field
+    @property
+    def validation_issues(self) -> list[ValidationIssue]:
+        """Validation failures, materialized on access"""
+        if self.issues_frame is None:
+            return []
+        return list(self.issues_frame)
 
 
 # ─────────────────────────────────────────────────────────────
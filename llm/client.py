@@ -2,7 +2,7 @@
 
 import asyncio
 import json
-from typing import Optional, List
+from typing import Any, Dict, List, Optional, Union
 from enum import Enum
 
 from core.exceptions import LLMError
@@ -33,6 +33,18 @@ except ImportError:
         GEMINI_AVAILABLE = False
 
 
+# A prompt is either plain text or Anthropic-style content blocks
+# ({"type": "text", "text": ..., "cache_control": ...}).
+Prompt = Union[str, List[Dict[str, Any]]]
+
+
+def _prompt_text(prompt: Prompt) -> str:
+    """Flatten content blocks to plain text for providers without block input"""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n\n".join(block.get("text", "") for block in prompt)
+
+
 class LLMClient:
     """Multi-provider LLM client with automatic fallback"""
     
@@ -90,6 +102,25 @@ class LLMClient:
         
         return providers
     
+    def model_signature(self) -> str:
+        """
+        Identify the providers and models this client answers with
+
+        Returns:
+            provider:model pairs in fallback order, for cache keys
+        """
+        models = {
+            LLMProvider.ANTHROPIC: settings.ANTHROPIC_MODEL,
+            LLMProvider.OPENAI: settings.OPENAI_MODEL,
+            LLMProvider.GEMINI: (
+                settings.GEMINI_MODEL_ID or settings.GEMINI_FALLBACK_MODEL_ID or "gemini-2.5-pro"
+            ),
+        }
+        return ",".join(
+            f"{provider.value}:{models[provider]}"
+            for provider in self._get_available_providers()
+        )
+    
     def _get_available_providers(self) -> List[LLMProvider]:
         """Get list of available providers in priority order"""
         available = []
@@ -104,7 +135,7 @@ class LLMClient:
     
     async def complete(
         self,
-        prompt: str,
+        prompt: Prompt,
         system: Optional[str] = None,
         max_tokens: Optional[int] = None,
         temperature: float = 0.0
@@ -113,7 +144,8 @@ class LLMClient:
         Send completion request with automatic fallback
         
         Args:
-            prompt: User prompt
+            prompt: User prompt, or content blocks whose static prefix is
+                marked with cache_control for provider prompt caching
             system: System prompt
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
@@ -164,7 +196,7 @@ class LLMClient:
     async def _call_provider(
         self,
         provider: LLMProvider,
-        prompt: str,
+        prompt: Prompt,
         system: Optional[str],
         max_tokens: int,
         temperature: float
@@ -177,18 +209,18 @@ class LLMClient:
             )
         elif provider == LLMProvider.OPENAI:
             return await self._call_openai(
-                prompt, system, max_tokens, temperature
+                _prompt_text(prompt), system, max_tokens, temperature
             )
         elif provider == LLMProvider.GEMINI:
             return await self._call_gemini(
-                prompt, system, max_tokens, temperature
+                _prompt_text(prompt), system, max_tokens, temperature
             )
         else:
             raise LLMError(f"Unknown provider: {provider}")
     
     async def _call_anthropic(
         self,
-        prompt: str,
+        prompt: Prompt,
         system: Optional[str],
         max_tokens: int,
         temperature: float
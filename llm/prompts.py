@@ -1,7 +1,7 @@
 """LLM prompt templates for various tasks"""
 
 import json
-from typing import Optional
+from typing import List, Optional
 import re
 from typing import Dict, Any
 from core.interfaces import LLMTask
@@ -162,20 +162,23 @@ Respond with JSON only:
 class ArchaeologyPrompt(LLMTask):
     """Prompt for data archaeology (Stage 3)"""
     
+    # Bump when the template changes to invalidate cached responses
+    PROMPT_VERSION = "2"
+    
     @property
-    def prompt_template(self) -> str:
-        return """Analyze this spreadsheet snapshot and identify where the actual data lives.
+    def instructions_template(self) -> str:
+        # Identical for every sheet, so it goes first where provider prompt
+        # caches can reuse it; the per-sheet snapshot follows in data_template.
+        return """Analyze the spreadsheet snapshot at the end of this prompt and identify where the actual data lives.
 
 CONTEXT:
 - This is raw data exported from a human-created spreadsheet
 - Humans often add titles, subtitles, blank rows, comments, totals
 - Your job: find the real tabular data boundaries
 
-SHEET: {sheet_name}
-TOTAL DIMENSIONS: {total_rows} rows × {total_cols} columns
-
-SNAPSHOT (first {preview_rows} rows):
-{snapshot}
+SNAPSHOT FORMAT:
+- First line lists column letters; each following line is "<row number> │ <cells>"
+- Cells are separated by │ and truncated to 25 characters; blank cells are empty
 
 ═══════════════════════════════════════════════════════════════════════════════
 
@@ -220,14 +223,40 @@ Respond with JSON only. No markdown, no explanation outside JSON:
     "confidence": <float 0-1>
 }}"""
     
+    @property
+    def data_template(self) -> str:
+        return """SHEET: {sheet_name}
+TOTAL DIMENSIONS: {total_rows} rows × {total_cols} columns
+
+SNAPSHOT (first {preview_rows} rows):
+{snapshot}"""
+    
+    @property
+    def prompt_template(self) -> str:
+        return self.instructions_template + "\n\n" + self.data_template
+    
+    def build_prompt_blocks(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build prompt as content blocks with the static prefix marked cacheable"""
+        return [
+            {
+                "type": "text",
+                "text": self.instructions_template.format(),
+                "cache_control": {"type": "ephemeral"},
+            },
+            {
+                "type": "text",
+                "text": self.data_template.format(
+                    sheet_name=context.get("sheet_name", "unknown"),
+                    total_rows=context.get("total_rows", 0),
+                    total_cols=context.get("total_cols", 0),
+                    preview_rows=context.get("preview_rows", 50),
+                    snapshot=context.get("snapshot", "")
+                ),
+            },
+        ]
+    
     def build_prompt(self, context: Dict[str, Any]) -> str:
-        return self.prompt_template.format(
-            sheet_name=context.get("sheet_name", "unknown"),
-            total_rows=context.get("total_rows", 0),
-            total_cols=context.get("total_cols", 0),
-            preview_rows=context.get("preview_rows", 50),
-            snapshot=context.get("snapshot", "")
-        )
+        return "\n\n".join(block["text"] for block in self.build_prompt_blocks(context))
     
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse archaeology response"""
@@ -238,17 +267,14 @@ Respond with JSON only. No markdown, no explanation outside JSON:
 class AnalysisPrompt(LLMTask):
     """Prompt for data analysis (Stage 6)"""
     
+    # Bump when the template changes to invalidate cached responses
+    PROMPT_VERSION = "2"
+    
     @property
-    def prompt_template(self) -> str:
-        return """Analyze this dataset and generate insights.
-
-DOMAIN: {domain}
-TABLE: {table_name}
-ROWS: {row_count}
-COLUMNS: {columns}
-
-DATA SUMMARY:
-{data_summary}
+    def instructions_template(self) -> str:
+        # Static across datasets; the dataset description is appended after it
+        # so provider prompt caches can reuse this prefix.
+        return """Analyze the dataset described at the end of this prompt and generate insights.
 
 Generate domain-specific analysis:
 - Key metrics and KPIs
@@ -278,14 +304,42 @@ Respond with JSON:
     ]
 }}"""
     
+    @property
+    def data_template(self) -> str:
+        return """DOMAIN: {domain}
+TABLE: {table_name}
+ROWS: {row_count}
+COLUMNS: {columns}
+
+DATA SUMMARY:
+{data_summary}"""
+    
+    @property
+    def prompt_template(self) -> str:
+        return self.instructions_template + "\n\n" + self.data_template
+    
+    def build_prompt_blocks(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build prompt as content blocks with the static prefix marked cacheable"""
+        return [
+            {
+                "type": "text",
+                "text": self.instructions_template.format(),
+                "cache_control": {"type": "ephemeral"},
+            },
+            {
+                "type": "text",
+                "text": self.data_template.format(
+                    domain=context.get("domain", "general"),
+                    table_name=context.get("table_name", "unknown"),
+                    row_count=context.get("row_count", 0),
+                    columns=", ".join(context.get("columns", [])),
+                    data_summary=context.get("data_summary", "")
+                ),
+            },
+        ]
+    
     def build_prompt(self, context: Dict[str, Any]) -> str:
-        return self.prompt_template.format(
-            domain=context.get("domain", "general"),
-            table_name=context.get("table_name", "unknown"),
-            row_count=context.get("row_count", 0),
-            columns=", ".join(context.get("columns", [])),
-            data_summary=context.get("data_summary", "")
-        )
+        return "\n\n".join(block["text"] for block in self.build_prompt_blocks(context))
     
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse analysis response"""
@@ -218,9 +218,12 @@ class AlphaStrikeEngine:
             if narrative_extraction.tensions:
                 parts.append("Tensions: " + "; ".join(t.opposing_views[:80] for t in narrative_extraction.tensions[:3]))
             data_summary = "\n".join(parts) or narrative_extraction.raw_transcript[:3000]
-        elif etl and etl.data_file_path and Path(etl.data_file_path).exists():
+        elif etl and (
+            etl.dataframe is not None
+            or (etl.data_file_path and Path(etl.data_file_path).exists())
+        ):
             try:
-                df = pd.read_csv(etl.data_file_path)
+                df = etl.dataframe if etl.dataframe is not None else pd.read_csv(etl.data_file_path)
                 data_summary = df.describe().to_string()
                 if len(data_summary) < 100:
                     data_summary = df.head(20).to_string()
@@ -4,10 +4,17 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 from openpyxl.utils.cell import coordinate_to_tuple
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from core.interfaces import Stage
 from core.models import (
     AppGenerationContext,
@@ -17,11 +24,115 @@ from core.models import (
     LogicExtractionResult,
 )
 from core.enums import InputType, CellRole
+from utils.excel import column_letter
+
+_HELPER_EXPORT_PATTERN = re.compile(r"^export const (\w+)", re.MULTILINE)
+_CALL_PATTERN = re.compile(r"\b([A-Za-z_]\w*)\(")
+_SUMIFS_CALL_PATTERN = re.compile(r"\bsumIfs\(")
+_GET_VALUE_PATTERN = re.compile(r'getValue(?P<numeric>Num)?\("(?P<address>[^"]*)", inputs\)')
+_NUMERIC_AGGREGATE_PATTERN = re.compile(
+    r"\b(?:SUM|AVERAGE|MIN|MAX)\s*\(\s*$", re.IGNORECASE
+)
+# Alternation order matters: strings shield their contents, ranges win over
+# their leading cell, and function names win over cell-like names (LOG10).
+_FORMULA_TOKEN_PATTERN = re.compile(
+    r'(?P<string>"[^"]*")'
+    r"|(?P<range>(?P<range_sheet>[A-Za-z0-9_ ]+!)?"
+    r"(?P<start>\$?[A-Z]{1,3}\$?\d+):(?P<end>\$?[A-Z]{1,3}\$?\d+))"
+    r"|(?P<function>\b[A-Za-z][A-Za-z0-9.]*)\s*\("
+    r"|(?<![A-Za-z0-9_])(?P<cell>(?P<cell_sheet>[A-Za-z0-9_ ]+!)?"
+    r"(?P<cell_ref>\$?[A-Z]{1,3}\$?\d+))"
+    r"|(?P<percent>\d+(?:\.\d+)?)%"
+    r"|(?P<operator><>|>=|<=|\^|&|=|;)"
+)
+_OPERATOR_REPLACEMENTS = {
+    "<>": "!=",
+    ">=": ">=",
+    "<=": "<=",
+    "^": "**",
+    "&": "+",
+    "=": "==",
+    ";": ",",
+}
+_FUNCTION_NAMES = {
+    "SUM": "sum",
+    "SUMIF": "sumIf",
+    "SUMIFS": "sumIfs",
+    "AVERAGE": "average",
+    "MIN": "min",
+    "MAX": "max",
+    "ABS": "abs",
+    "ROUND": "round",
+    "ROUNDUP": "roundUp",
+    "ROUNDDOWN": "roundDown",
+    "CONCAT": "concat",
+    "CONCATENATE": "concat",
+    "AND": "andFunc",
+    "OR": "orFunc",
+    "NOT": "notFunc",
+    "IFERROR": "ifError",
+    "IF": "ifFunc",
+    "TODAY": "today",
+    "NOW": "now",
+    "DATE": "dateFunc",
+    "DATEDIF": "datedif",
+    "EOMONTH": "eomonth",
+    "WORKDAY": "workday",
+    "YEAR": "yearFunc",
+    "MONTH": "monthFunc",
+    "DAY": "dayFunc",
+    "MATCH": "matchFunc",
+    "INDEX": "indexFunc",
+    "VLOOKUP": "vlookup",
+    "XLOOKUP": "xlookup",
+    "COUNTIF": "countIf",
+    "COUNTIFS": "countIfs",
+    "AVERAGEIFS": "averageIfs",
+}
+
+
+def _json_literal(value) -> str:
+    """Compact JSON for per-calculation literals, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value)
+
+
+@lru_cache(maxsize=4096)
+def _expand_range_cached(
+    sheet: str, start: str, end: str, limit: int
+) -> Optional[Tuple[Tuple[str, ...], ...]]:
+    """Expand a range into row-major addresses; dragged formulas reuse ranges."""
+    try:
+        start_row, start_col = coordinate_to_tuple(start)
+        end_row, end_col = coordinate_to_tuple(end)
+    except ValueError:
+        return None
+    min_row = min(start_row, end_row)
+    max_row = max(start_row, end_row)
+    min_col = min(start_col, end_col)
+    max_col = max(start_col, end_col)
+    total = (max_row - min_row + 1) * (max_col - min_col + 1)
+    if total > limit:
+        return None
+    prefixes = [f"{sheet}!{column_letter(col)}" for col in range(min_col, max_col + 1)]
+    return tuple(
+        tuple([f"{prefix}{row}" for prefix in prefixes])
+        for row in range(min_row, max_row + 1)
+    )
 
 
 class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
     """Generate application code from extracted logic."""
 
+    TRANSLATION_CACHE_SIZE = 8192
+
+    def __init__(self):
+        # Filled-down formulas repeat verbatim across a workbook; reuse their JS.
+        self._translate_cached = lru_cache(maxsize=self.TRANSLATION_CACHE_SIZE)(
+            self._translate_expression
+        )
+
     @property
     def name(self) -> str:
         return "Code Generation"
@@ -72,11 +183,14 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "src/lib/calculations/index.ts": self._calculations_index(logic),
             "src/lib/calculations/types.ts": self._calculations_types(logic),
         }
+        helpers = self._calculation_helpers()
+        files["src/lib/calculations/helpers.ts"] = helpers
+        helper_names = set(_HELPER_EXPORT_PATTERN.findall(helpers))
         for calc in (logic.calculations or []):
             if not calc.id:
                 continue
             files[f"src/lib/calculations/{self._calculation_filename(calc.id)}"] = (
-                self._calculation_file(calc)
+                self._calculation_file(calc, helper_names)
             )
         return GeneratedProject(
             files=files,
@@ -405,32 +519,32 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
         return prisma_lines
 
     def _tests_stub(self, input_data: LogicExtractionResult) -> str:
-        lines = [
-            "import { calculations } from '../src/lib/calculations';",
-            "",
-            "describe('Generated calculations', () => {",
-        ]
+        return "\n".join(self._iter_tests_stub(input_data))
+
+    def _iter_tests_stub(self, input_data: LogicExtractionResult) -> Iterator[str]:
+        yield "import { calculations } from '../src/lib/calculations';"
+        yield ""
+        yield "describe('Generated calculations', () => {"
         if not input_data.calculations:
-            lines.append("  it('has no calculations', () => {")
-            lines.append("    expect(Object.keys(calculations)).toHaveLength(0);")
-            lines.append("  });")
+            yield "  it('has no calculations', () => {"
+            yield "    expect(Object.keys(calculations)).toHaveLength(0);"
+            yield "  });"
+        elif input_data.test_suite:
+            for test in input_data.test_suite:
+                calc_id = test.name.split('_')[0]
+                yield f"  it('calculates {test.name}', () => {{"
+                yield f"    const result = calculations['{calc_id}']({_json_literal(test.inputs)});"
+                yield "    expect(result).toBeDefined();"
+                yield "  });"
         else:
-            if input_data.test_suite:
-                for test in input_data.test_suite:
-                    lines.append(f"  it('calculates {test.name}', () => {{")
-                    calc_id = test.name.split('_')[0]
-                    lines.append(f"    const result = calculations['{calc_id}']({json.dumps(test.inputs)});")
-                    lines.append("    expect(result).toBeDefined();")
-                    lines.append("  });")
-            else:
-                for calc in input_data.calculations:
-                    lines.append(f"  it('calculates {calc.id}', () => {{")
-                    lines.append(f"    const result = calculations['{calc.id}']({{}});")
-                    lines.append("    expect(result).toBeDefined();")
-                    lines.append("  });")
-        lines.append("});")
-        lines.append("")
-        return "\n".join(lines)
+            for calc in input_data.calculations:
+                yield f"  it('calculates {calc.id}', () => {{"
+                yield f"    const result = calculations['{calc.id}']({{}});"
+                yield "    expect(result).toBeDefined();"
+                yield "  });"
+        yield "});"
+        yield ""
+
     def _calculate_route(self) -> str:
         return "\n".join([
             "import { NextResponse } from 'next/server';",
@@ -1095,22 +1209,24 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
         ])
 
     def _calculations_index(self, input_data: LogicExtractionResult) -> str:
-        lines = [
-            "import type { CalculationFn } from './types';",
-            "",
+        return "\n".join(self._iter_calculations_index(input_data))
+
+    def _iter_calculations_index(self, input_data: LogicExtractionResult) -> Iterator[str]:
+        names = [
+            (calc.id, self._calculation_function_name(calc.id))
+            for calc in (input_data.calculations or [])
         ]
-        for calc in (input_data.calculations or []):
-            fn_name = self._calculation_function_name(calc.id)
-            file_name = self._calculation_filename(calc.id).replace(".ts", "")
-            lines.append(f"import {{ {fn_name} }} from './{file_name}';")
-        lines.append("")
-        lines.append("export const calculations: Record<string, CalculationFn> = {")
-        for calc in (input_data.calculations or []):
-            fn_name = self._calculation_function_name(calc.id)
-            lines.append(f"  \"{calc.id}\": {fn_name},")
-        lines.append("};")
-        lines.append("")
-        return "\n".join(lines)
+        yield "import type { CalculationFn } from './types';"
+        yield ""
+        for calc_id, fn_name in names:
+            file_name = self._calculation_filename(calc_id).replace(".ts", "")
+            yield f"import {{ {fn_name} }} from './{file_name}';"
+        yield ""
+        yield "export const calculations: Record<string, CalculationFn> = {"
+        for calc_id, fn_name in names:
+            yield f"  \"{calc_id}\": {fn_name},"
+        yield "};"
+        yield ""
 
     def _calculations_types(self, input_data: LogicExtractionResult) -> str:
         ids = [calc.id for calc in (input_data.calculations or [])]
@@ -1730,11 +1846,7 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
         return address.replace("!", "_").replace(":", "_")
 
     def _col_letter(self, col_idx: int) -> str:
-        result = ""
-        while col_idx > 0:
-            col_idx, remainder = divmod(col_idx - 1, 26)
-            result = chr(65 + remainder) + result
-        return result
+        return column_letter(col_idx)
 
     def _calculation_filename(self, calc_id: str) -> str:
         return f"{self._sanitize_id(calc_id)}.ts"
@@ -1743,15 +1855,9 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
         base = self._sanitize_id(calc_id)
         return f"calculate_{base}"
 
-    def _calculation_file(self, calc) -> str:
-        fn_name = self._calculation_function_name(calc.id)
-        inputs = ", ".join(calc.inputs) if calc.inputs else "none"
-        formula = calc.formulas[0].raw if calc.formulas and len(calc.formulas) > 0 else ""
-        expression = self._translate_formula(formula, calc.id)
+    def _calculation_helpers(self) -> str:
         return "\n".join([
-            "import type { CalculationFn } from './types';",
-            "",
-            "const toNumber = (value: unknown) => {",
+            "export const toNumber = (value: unknown) => {",
             "  if (value === null || value === undefined || value === '') return 0;",
             "  if (typeof value === 'number') return value;",
             "  const raw = String(value).trim();",
@@ -1777,7 +1883,7 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  if (Number.isNaN(num)) return 0;",
             "  return percent ? num / 100 : num;",
             "};",
-            "const excelSerialFromDate = (year: number, month: number, day: number) => {",
+            "export const excelSerialFromDate = (year: number, month: number, day: number) => {",
             "  const base = new Date(Date.UTC(1899, 11, 30));",
             "  const target = new Date(Date.UTC(year, month - 1, day));",
             "  let days = Math.round((target.getTime() - base.getTime()) / 86400000);",
@@ -1786,13 +1892,13 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  }",
             "  return days;",
             "};",
-            "const dateFromSerial = (serial: number) => {",
+            "export const dateFromSerial = (serial: number) => {",
             "  const base = new Date(Date.UTC(1899, 11, 30));",
             "  let days = Math.floor(serial);",
             "  if (days >= 60) days -= 1;",
             "  return new Date(base.getTime() + days * 86400000);",
             "};",
-            "const toDate = (value: unknown) => {",
+            "export const toDate = (value: unknown) => {",
             "  if (value instanceof Date) return value;",
             "  if (typeof value === 'number') {",
             "    return dateFromSerial(value);",
@@ -1804,51 +1910,85 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  const date = new Date(String(value));",
             "  return Number.isNaN(date.getTime()) ? new Date(0) : date;",
             "};",
-            "const flatten = (values: unknown[]) => values.flat(Infinity);",
-            "",
-            "const keyFor = (address: string) => address.replace(/[!:]/g, '_');",
-            "const getValue = (address: string, inputs: Record<string, unknown>) => inputs[keyFor(address)];",
-            "const sum = (...values: unknown[]) => flatten(values).reduce((acc, v) => acc + toNumber(v), 0);",
-            "const average = (...values: unknown[]) => {",
-            "  const flat = flatten(values).map(toNumber);",
-            "  return flat.length ? flat.reduce((acc, v) => acc + v, 0) / flat.length : 0;",
+            "const flatRanges = new WeakSet<object>();",
+            "export const flatRange = (values: unknown[]) => {",
+            "  flatRanges.add(values);",
+            "  return values;",
+            "};",
+            "export const flatten = (values: unknown[]) => {",
+            "  if (flatRanges.has(values)) return values;",
+            "  if (values.length === 1 && flatRanges.has(values[0] as object)) return values[0] as unknown[];",
+            "  return values.flat(Infinity);",
             "};",
-            "const min = (...values: unknown[]) => {",
-            "  const flat = flatten(values).map(toNumber);",
+            "",
+            "export const keyFor = (address: string) => address.replace(/[!:]/g, '_');",
+            "export const getValue = (address: string, inputs: Record<string, unknown>) => inputs[keyFor(address)];",
+            "export const getValueNum = (address: string, inputs: Record<string, unknown>) => toNumber(getValue(address, inputs));",
+            "export const isBlank = (value: unknown) => value === null || value === undefined || value === '';",
+            "export const numbers = (values: unknown[]) => {",
+            "  const out: number[] = [];",
+            "  for (const value of values) {",
+            "    if (ArrayBuffer.isView(value)) {",
+            "      const nums = value as Float64Array;",
+            "      for (let i = 0; i < nums.length; i += 1) out.push(nums[i]);",
+            "    } else {",
+            "      for (const item of flatten([value])) out.push(toNumber(item));",
+            "    }",
+            "  }",
+            "  return out;",
+            "};",
+            "export const sum = (...values: unknown[]) => {",
+            "  let total = 0;",
+            "  for (const value of values) {",
+            "    if (ArrayBuffer.isView(value)) {",
+            "      const nums = value as Float64Array;",
+            "      for (let i = 0, n = nums.length; i < n; i += 1) total += nums[i];",
+            "    } else {",
+            "      for (const item of flatten([value])) total += toNumber(item);",
+            "    }",
+            "  }",
+            "  return total;",
+            "};",
+            "export const average = (...values: unknown[]) => {",
+            "  const flat = numbers(values);",
+            "  return flat.length ? sum(flat) / flat.length : 0;",
+            "};",
+            "export const min = (...values: unknown[]) => {",
+            "  const flat = numbers(values);",
             "  return flat.length ? Math.min(...flat) : 0;",
             "};",
-            "const max = (...values: unknown[]) => {",
-            "  const flat = flatten(values).map(toNumber);",
+            "export const max = (...values: unknown[]) => {",
+            "  const flat = numbers(values);",
             "  return flat.length ? Math.max(...flat) : 0;",
             "};",
-            "const abs = (value: unknown) => Math.abs(toNumber(value));",
-            "const round = (value: unknown, digits: unknown = 0) => {",
+            "export const abs = (value: unknown) => Math.abs(toNumber(value));",
+            "export const round = (value: unknown, digits: unknown = 0) => {",
             "  const factor = 10 ** toNumber(digits);",
             "  return Math.round(toNumber(value) * factor) / factor;",
             "};",
-            "const roundUp = (value: unknown, digits: unknown = 0) => {",
+            "export const roundUp = (value: unknown, digits: unknown = 0) => {",
             "  const factor = 10 ** toNumber(digits);",
             "  return Math.ceil(toNumber(value) * factor) / factor;",
             "};",
-            "const roundDown = (value: unknown, digits: unknown = 0) => {",
+            "export const roundDown = (value: unknown, digits: unknown = 0) => {",
             "  const factor = 10 ** toNumber(digits);",
             "  return Math.floor(toNumber(value) * factor) / factor;",
             "};",
-            "const concat = (...values: unknown[]) => values.flat().map((v) => `${v ?? ''}`).join('');",
-            "const andFunc = (...values: unknown[]) => values.flat().every((v) => Boolean(v));",
-            "const orFunc = (...values: unknown[]) => values.flat().some((v) => Boolean(v));",
-            "const notFunc = (value: unknown) => !Boolean(value);",
-            "const ifError = (value: unknown, fallback: unknown) => {",
+            "export const concat = (...values: unknown[]) => values.flat().map((v) => `${v ?? ''}`).join('');",
+            "export const andFunc = (...values: unknown[]) => values.flat().every((v) => Boolean(v));",
+            "export const orFunc = (...values: unknown[]) => values.flat().some((v) => Boolean(v));",
+            "export const notFunc = (value: unknown) => !Boolean(value);",
+            "export const ifError = (value: unknown, fallback: unknown) => {",
             "  if (value === null || value === undefined) return fallback;",
             "  if (typeof value === 'number' && Number.isNaN(value)) return fallback;",
             "  return value;",
             "};",
-            "const today = () => excelSerialFromDate(",
+            "export const today = () => excelSerialFromDate(",
             "  new Date().getUTCFullYear(),",
             "  new Date().getUTCMonth() + 1,",
             "  new Date().getUTCDate()",
             ");",
-            "const now = () => {",
+            "export const now = () => {",
             "  const date = new Date();",
             "  const serial = excelSerialFromDate(",
             "    date.getUTCFullYear(),",
@@ -1857,13 +1997,13 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  );",
             "  return serial + (date.getUTCHours() * 3600 + date.getUTCMinutes() * 60 + date.getUTCSeconds()) / 86400;",
             "};",
-            "const dateFunc = (year: unknown, month: unknown, day: unknown) => (",
+            "export const dateFunc = (year: unknown, month: unknown, day: unknown) => (",
             "  excelSerialFromDate(toNumber(year), toNumber(month), toNumber(day))",
             ");",
-            "const yearFunc = (value: unknown) => toDate(value).getUTCFullYear();",
-            "const monthFunc = (value: unknown) => toDate(value).getUTCMonth() + 1;",
-            "const dayFunc = (value: unknown) => toDate(value).getUTCDate();",
-            "const datedif = (start: unknown, end: unknown, unit: unknown) => {",
+            "export const yearFunc = (value: unknown) => toDate(value).getUTCFullYear();",
+            "export const monthFunc = (value: unknown) => toDate(value).getUTCMonth() + 1;",
+            "export const dayFunc = (value: unknown) => toDate(value).getUTCDate();",
+            "export const datedif = (start: unknown, end: unknown, unit: unknown) => {",
             "  const startDate = toDate(start);",
             "  const endDate = toDate(end);",
             "  const unitStr = String(unit || 'D').toUpperCase();",
@@ -1890,13 +2030,13 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  }",
             "  return 0;",
             "};",
-            "const eomonth = (start: unknown, months: unknown) => {",
+            "export const eomonth = (start: unknown, months: unknown) => {",
             "  const date = toDate(start);",
             "  const offset = toNumber(months);",
             "  const end = new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth() + offset + 1, 0));",
             "  return excelSerialFromDate(end.getUTCFullYear(), end.getUTCMonth() + 1, end.getUTCDate());",
             "};",
-            "const workday = (start: unknown, days: unknown, holidays: unknown = []) => {",
+            "export const workday = (start: unknown, days: unknown, holidays: unknown = []) => {",
             "  let date = toDate(start);",
             "  let remaining = toNumber(days);",
             "  const holidayList = (Array.isArray(holidays) ? holidays : [holidays])",
@@ -1913,7 +2053,7 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  }",
             "  return excelSerialFromDate(date.getUTCFullYear(), date.getUTCMonth() + 1, date.getUTCDate());",
             "};",
-            "const matchFunc = (lookup: unknown, range: unknown[], matchType: unknown = 0) => {",
+            "export const matchFunc = (lookup: unknown, range: unknown[], matchType: unknown = 0) => {",
             "  const list = flatten(range);",
             "  const match = Number(matchType);",
             "  if (match === 0) {",
@@ -1930,7 +2070,7 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  nums.forEach((num, i) => { if (num >= val && idx === -1) idx = i; });",
             "  return idx + 1;",
             "};",
-            "const indexFunc = (table: unknown, row: unknown, col: unknown = 1) => {",
+            "export const indexFunc = (table: unknown, row: unknown, col: unknown = 1) => {",
             "  const r = toNumber(row) - 1;",
             "  const c = toNumber(col) - 1;",
             "  if (Array.isArray(table)) {",
@@ -1943,7 +2083,7 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  }",
             "  return null;",
             "};",
-            "const vlookup = (lookup: unknown, table: unknown, col: unknown, rangeLookup: unknown = false) => {",
+            "export const vlookup = (lookup: unknown, table: unknown, col: unknown, rangeLookup: unknown = false) => {",
             "  if (!Array.isArray(table)) return null;",
             "  const colIndex = toNumber(col) - 1;",
             "  const rows = table as unknown[];",
@@ -1955,109 +2095,123 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "  if (!match || !Array.isArray(match)) return null;",
             "  return match[colIndex] ?? null;",
             "};",
-            "const matchesCriteria = (value: unknown, criteria: unknown) => {",
-            "  if (criteria === null || criteria === undefined) return false;",
-            "  if (typeof criteria === 'number') return toNumber(value) === criteria;",
+            "export const compileCriteria = (criteria: unknown) => {",
+            "  if (criteria === null || criteria === undefined) return (_value: unknown) => false;",
+            "  if (typeof criteria === 'number') return (value: unknown) => toNumber(value) === criteria;",
             "  const crit = String(criteria);",
             "  const opMatch = crit.match(/^(>=|<=|<>|=|>|<)(.*)$/);",
             "  const raw = opMatch ? opMatch[2] : crit;",
             "  const rawValue = raw.replace(/^\"|\"$/g, '');",
             "  if (rawValue.includes('*')) {",
             "    const pattern = new RegExp('^' + rawValue.replace(/\\*/g, '.*') + '$', 'i');",
-            "    return pattern.test(String(value ?? ''));",
+            "    return (value: unknown) => pattern.test(String(value ?? ''));",
             "  }",
-            "  const left = toNumber(value);",
             "  const right = toNumber(rawValue);",
             "  const op = opMatch ? opMatch[1] : '=';",
             "  switch (op) {",
-            "    case '>': return left > right;",
-            "    case '<': return left < right;",
-            "    case '>=': return left >= right;",
-            "    case '<=': return left <= right;",
-            "    case '<>': return left !== right;",
-            "    default: return String(value ?? '') === rawValue;",
+            "    case '>': return (value: unknown) => toNumber(value) > right;",
+            "    case '<': return (value: unknown) => toNumber(value) < right;",
+            "    case '>=': return (value: unknown) => toNumber(value) >= right;",
+            "    case '<=': return (value: unknown) => toNumber(value) <= right;",
+            "    case '<>': return (value: unknown) => toNumber(value) !== right;",
+            "    default: return (value: unknown) => String(value ?? '') === rawValue;",
+            "  }",
+            "};",
+            "export const compilePairs = (criteriaPairs: unknown[]) => {",
+            "  const pairs: Array<{ range: unknown[]; test: (value: unknown) => boolean }> = [];",
+            "  for (let i = 0; i < criteriaPairs.length; i += 2) {",
+            "    pairs.push({ range: flatten([criteriaPairs[i]]), test: compileCriteria(criteriaPairs[i + 1]) });",
             "  }",
+            "  return pairs;",
             "};",
-            "const sumIf = (range: unknown, criteria: unknown, sumRange?: unknown) => {",
+            "export const matchesPairs = (pairs: Array<{ range: unknown[]; test: (value: unknown) => boolean }>, idx: number) => {",
+            "  for (let p = 0; p < pairs.length; p += 1) {",
+            "    if (!pairs[p].test(pairs[p].range[idx])) return false;",
+            "  }",
+            "  return true;",
+            "};",
+            "export const sumIf = (range: unknown, criteria: unknown, sumRange?: unknown) => {",
             "  const list = flatten([range]);",
             "  const sums = sumRange ? flatten([sumRange]) : list;",
-            "  return list.reduce((acc, value, idx) => {",
-            "    if (matchesCriteria(value, criteria)) {",
-            "      return acc + toNumber(sums[idx]);",
-            "    }",
-            "    return acc;",
-            "  }, 0);",
+            "  const test = compileCriteria(criteria);",
+            "  let total = 0;",
+            "  for (let i = 0; i < list.length; i += 1) {",
+            "    if (test(list[i])) total += toNumber(sums[i]);",
+            "  }",
+            "  return total;",
             "};",
-            "const sumIfs = (sumRange: unknown, ...criteriaPairs: unknown[]) => {",
+            "export const sumIfs = (sumRange: unknown, ...criteriaPairs: unknown[]) => {",
             "  const sums = flatten([sumRange]);",
-            "  const pairs: Array<{ range: unknown[]; criteria: unknown }> = [];",
-            "  for (let i = 0; i < criteriaPairs.length; i += 2) {",
-            "    pairs.push({ range: flatten([criteriaPairs[i]]), criteria: criteriaPairs[i + 1] });",
+            "  const pairs = compilePairs(criteriaPairs);",
+            "  let total = 0;",
+            "  for (let idx = 0; idx < sums.length; idx += 1) {",
+            "    if (matchesPairs(pairs, idx)) total += toNumber(sums[idx]);",
             "  }",
-            "  return sums.reduce((acc, value, idx) => {",
-            "    const matches = pairs.every((pair) => matchesCriteria(pair.range[idx], pair.criteria));",
-            "    return matches ? acc + toNumber(value) : acc;",
-            "  }, 0);",
+            "  return total;",
             "};",
-            "const countIf = (range: unknown, criteria: unknown) => {",
+            "export const countIf = (range: unknown, criteria: unknown) => {",
             "  const list = flatten([range]);",
-            "  return list.reduce((acc, value) => acc + (matchesCriteria(value, criteria) ? 1 : 0), 0);",
-            "};",
-            "const countIfs = (...criteriaPairs: unknown[]) => {",
-            "  const pairs: Array<{ range: unknown[]; criteria: unknown }> = [];",
-            "  for (let i = 0; i < criteriaPairs.length; i += 2) {",
-            "    pairs.push({ range: flatten([criteriaPairs[i]]), criteria: criteriaPairs[i + 1] });",
+            "  const test = compileCriteria(criteria);",
+            "  let total = 0;",
+            "  for (let i = 0; i < list.length; i += 1) {",
+            "    if (test(list[i])) total += 1;",
             "  }",
+            "  return total;",
+            "};",
+            "export const countIfs = (...criteriaPairs: unknown[]) => {",
+            "  const pairs = compilePairs(criteriaPairs);",
             "  if (!pairs.length) return 0;",
             "  const maxLen = Math.max(...pairs.map((pair) => pair.range.length));",
             "  let total = 0;",
             "  for (let idx = 0; idx < maxLen; idx += 1) {",
-            "    const matches = pairs.every((pair) => matchesCriteria(pair.range[idx], pair.criteria));",
-            "    if (matches) total += 1;",
+            "    if (matchesPairs(pairs, idx)) total += 1;",
             "  }",
             "  return total;",
             "};",
-            "const averageIfs = (avgRange: unknown, ...criteriaPairs: unknown[]) => {",
+            "export const averageIfs = (avgRange: unknown, ...criteriaPairs: unknown[]) => {",
             "  const averages = flatten([avgRange]);",
-            "  const pairs: Array<{ range: unknown[]; criteria: unknown }> = [];",
-            "  for (let i = 0; i < criteriaPairs.length; i += 2) {",
-            "    pairs.push({ range: flatten([criteriaPairs[i]]), criteria: criteriaPairs[i + 1] });",
-            "  }",
+            "  const pairs = compilePairs(criteriaPairs);",
             "  let total = 0;",
             "  let count = 0;",
-            "  averages.forEach((value, idx) => {",
-            "    const matches = pairs.every((pair) => matchesCriteria(pair.range[idx], pair.criteria));",
-            "    if (matches) {",
-            "      total += toNumber(value);",
+            "  for (let idx = 0; idx < averages.length; idx += 1) {",
+            "    if (matchesPairs(pairs, idx)) {",
+            "      total += toNumber(averages[idx]);",
             "      count += 1;",
             "    }",
-            "  });",
+            "  }",
             "  return count ? total / count : 0;",
             "};",
-            "const xlookup = (lookup: unknown, lookupArray: unknown, returnArray: unknown, notFound: unknown = null) => {",
+            "export const xlookup = (lookup: unknown, lookupArray: unknown, returnArray: unknown, notFound: unknown = null) => {",
             "  const lookupList = flatten([lookupArray]);",
             "  const returnList = flatten([returnArray]);",
             "  const idx = lookupList.findIndex((item) => item === lookup);",
             "  if (idx === -1) return notFound;",
             "  return returnList[idx] ?? notFound;",
             "};",
-            "const ifFunc = (cond: unknown, a: unknown, b: unknown) => (cond ? a : b);",
-            "const unsupportedRange = (range: string) => {",
+            "export const ifFunc = (cond: unknown, a: unknown, b: unknown) => (cond ? a : b);",
+            "export const unsupportedRange = (range: string) => {",
             "  throw new Error(`Unsupported range: ${range}`);",
             "};",
             "",
+        ])
+
+    def _calculation_file(self, calc, helper_names: Set[str]) -> str:
+        fn_name = self._calculation_function_name(calc.id)
+        inputs = ", ".join(calc.inputs) if calc.inputs else "none"
+        formula = calc.formulas[0].raw if calc.formulas and len(calc.formulas) > 0 else ""
+        expression = self._translate_formula(formula, calc.id)
+        body = self._calculation_body(expression, calc.inputs or [])
+        used = helper_names.intersection(_CALL_PATTERN.findall("\n".join(body)))
+        imports = ["import type { CalculationFn } from './types';"]
+        if used:
+            imports.append(f"import {{ {', '.join(sorted(used))} }} from './helpers';")
+        return "\n".join([
+            *imports,
+            "",
             f"// Inputs: {inputs}",
             f"// Output: {calc.id}",
             f"export const {fn_name}: CalculationFn = (inputs) => {{",
-            f"  const required = {json.dumps(calc.inputs if calc.inputs else [])};",
-            "  const missing = required.filter((addr) => {",
-            "    const value = getValue(addr, inputs);",
-            "    return value === null || value === undefined || value === '';",
-            "  });",
-            "  if (missing.length) {",
-            "    throw new Error(`Missing required inputs: ${missing.join(', ')}`);",
-            "  }",
-            f"  const result = {expression};",
+            *body,
             "  return {",
             f"    \"{calc.id}\": result,",
             "  };",
@@ -2065,156 +2219,195 @@ class CodeGenerator(Stage[AppGenerationContext, GeneratedProject]):
             "",
         ])
 
+    def _calculation_body(self, expression: str, required: List[str]) -> List[str]:
+        """Read every referenced input once into a local, then check and evaluate.
+
+        The required addresses are known at generation time, so the missing
+        input check is unrolled over those locals instead of filtering a list
+        of addresses with another getValue per entry.
+        """
+        locals_by_address: Dict[str, str] = {}
+        taken: Set[str] = set()
+
+        def _local(address: str) -> str:
+            name = locals_by_address.get(address)
+            if name is None:
+                base = "v_" + re.sub(r"\W", "_", address)
+                name = base
+                suffix = 1
+                while name in taken:
+                    name = f"{base}_{suffix}"
+                    suffix += 1
+                taken.add(name)
+                locals_by_address[address] = name
+            return name
+
+        def _replace(match):
+            name = _local(match.group("address"))
+            return f"toNumber({name})" if match.group("numeric") else name
+
+        expression = _GET_VALUE_PATTERN.sub(_replace, expression)
+        required = list(dict.fromkeys(required))
+        for address in required:
+            _local(address)
+
+        lines = [
+            f"  const {name} = getValue({_json_literal(address)}, inputs);"
+            for address, name in locals_by_address.items()
+        ]
+        if required:
+            lines.append("  const missing: string[] = [];")
+            for address in required:
+                lines.append(
+                    f"  if (isBlank({locals_by_address[address]})) missing.push({_json_literal(address)});"
+                )
+            lines.extend([
+                "  if (missing.length) {",
+                "    throw new Error(`Missing required inputs: ${missing.join(', ')}`);",
+                "  }",
+            ])
+        lines.append(f"  const result = {expression};")
+        return lines
+
     def _translate_formula(self, formula: str, default_address: str) -> str:
         if not formula:
             return "null"
         default_sheet = default_address.split("!", 1)[0] if "!" in default_address else ""
-        expr = formula.lstrip("=")
-        expr = expr.replace(";", ",")
-        expr, string_literals = self._extract_string_literals(expr)
-        expr, range_replacements = self._extract_range_placeholders(expr, default_sheet)
-        expr = self._replace_cell_refs(expr, default_sheet)
-        for token, replacement in range_replacements.items():
-            expr = expr.replace(token, replacement)
-        expr = self._replace_functions(expr)
-        expr = self._replace_operators(expr)
-        for token, literal in string_literals.items():
-            expr = expr.replace(token, literal)
-        return expr
-
-    def _extract_range_placeholders(
-        self, expr: str, default_sheet: str
-    ) -> tuple[str, Dict[str, str]]:
-        range_pattern = re.compile(
-            r"(?P<sheet>[A-Za-z0-9_ ]+!)?"
-            r"(?P<start>\$?[A-Z]{1,3}\$?\d+):"
-            r"(?P<end>\$?[A-Z]{1,3}\$?\d+)"
-        )
-        replacements: Dict[str, str] = {}
-        index = 0
-
-        def _replace(match):
-            nonlocal index
-            sheet = match.group("sheet")[:-1] if match.group("sheet") else default_sheet
-            start = match.group("start").replace("$", "")
-            end = match.group("end").replace("$", "")
-            if not sheet:
-                replacement = f'unsupportedRange("{start}:{end}")'
-            else:
-                addresses = self._expand_range(sheet, start, end, limit=200)
-                if addresses is None:
-                    replacement = f'unsupportedRange("{sheet}!{start}:{end}")'
-                else:
-                    values = ", ".join([f'getValue("{addr}", inputs)' for addr in addresses])
-                    replacement = f"[{values}]"
-            token = f"__RANGE_{index}__"
-            replacements[token] = replacement
-            index += 1
-            return token
-
-        return range_pattern.sub(_replace, expr), replacements
-
-    def _replace_cell_refs(self, expr: str, default_sheet: str) -> str:
-        cell_pattern = re.compile(
-            r"(?<![A-Za-z0-9_])"
-            r"(?P<sheet>[A-Za-z0-9_ ]+!)?"
-            r"(?P<cell>\$?[A-Z]{1,3}\$?\d+)"
-        )
-
-        def _replace(match):
-            sheet = match.group("sheet")[:-1] if match.group("sheet") else default_sheet
-            cell = match.group("cell").replace("$", "")
-            if sheet:
-                return f'getValue("{sheet}!{cell}", inputs)'
-            return f'getValue("{cell}", inputs)'
+        return self._translate_cached(formula, default_sheet)
 
-        return cell_pattern.sub(_replace, expr)
+    def _translate_expression(self, formula: str, default_sheet: str) -> str:
+        """Translate an Excel formula body into a JS expression in one scan.
 
-    def _extract_string_literals(self, expr: str) -> tuple[str, Dict[str, str]]:
-        string_pattern = re.compile(r'"([^"]*)"')
-        replacements: Dict[str, str] = {}
-        index = 0
+        String literals are matched first and emitted verbatim, so operators
+        and function names inside them are never rewritten.
+        """
+        expr = formula.lstrip("=")
 
         def _replace(match):
-            nonlocal index
-            token = f"__STR_{index}__"
-            replacements[token] = f"\"{match.group(1)}\""
-            index += 1
-            return token
-
-        return string_pattern.sub(_replace, expr), replacements
-
-    def _replace_functions(self, expr: str) -> str:
-        replacements = {
-            "SUM": "sum",
-            "SUMIF": "sumIf",
-            "SUMIFS": "sumIfs",
-            "AVERAGE": "average",
-            "MIN": "min",
-            "MAX": "max",
-            "ABS": "abs",
-            "ROUND": "round",
-            "ROUNDUP": "roundUp",
-            "ROUNDDOWN": "roundDown",
-            "CONCAT": "concat",
-            "CONCATENATE": "concat",
-            "AND": "andFunc",
-            "OR": "orFunc",
-            "NOT": "notFunc",
-            "IFERROR": "ifError",
-            "IF": "ifFunc",
-            "TODAY": "today",
-            "NOW": "now",
-            "DATE": "dateFunc",
-            "DATEDIF": "datedif",
-            "EOMONTH": "eomonth",
-            "WORKDAY": "workday",
-            "YEAR": "yearFunc",
-            "MONTH": "monthFunc",
-            "DAY": "dayFunc",
-            "MATCH": "matchFunc",
-            "INDEX": "indexFunc",
-            "VLOOKUP": "vlookup",
-            "XLOOKUP": "xlookup",
-            "COUNTIF": "countIf",
-            "COUNTIFS": "countIfs",
-            "AVERAGEIFS": "averageIfs",
-        }
-        for excel_name, js_name in replacements.items():
-            # Escape excel_name and build pattern without raw string to avoid regex conflicts
-            pattern = r"\b" + re.escape(excel_name) + r"\s*\("
-            expr = re.sub(pattern, f"{js_name}(", expr, flags=re.IGNORECASE)
+            kind = match.lastgroup
+            if kind == "string":
+                return match.group(0)
+            if kind == "range":
+                return self._range_replacement(match, expr, default_sheet)
+            if kind == "function":
+                js_name = _FUNCTION_NAMES.get(match.group("function").upper())
+                return f"{js_name}(" if js_name else match.group(0)
+            if kind == "cell":
+                sheet = self._token_sheet(match.group("cell_sheet"), default_sheet)
+                cell = match.group("cell_ref").replace("$", "")
+                if sheet:
+                    return f'getValue("{sheet}!{cell}", inputs)'
+                return f'getValue("{cell}", inputs)'
+            if kind == "percent":
+                return f"({match.group('percent')}/100)"
+            return _OPERATOR_REPLACEMENTS[match.group(0)]
+
+        return self._unroll_sumifs(_FORMULA_TOKEN_PATTERN.sub(_replace, expr))
+
+    def _unroll_sumifs(self, expr: str) -> str:
+        """Inline SUMIFS calls whose criteria pairs are known at generation time.
+
+        Each call becomes an IIFE that compiles its criteria once and tests
+        every pair with a fixed && chain, instead of the runtime helper
+        building a pairs array and calling every() for each row.
+        """
+        match = _SUMIFS_CALL_PATTERN.search(expr)
+        while match:
+            args, close_idx = self._split_call_args(expr, match.end() - 1)
+            if args is None:
+                break
+            args = [self._unroll_sumifs(arg) for arg in args]
+            if len(args) >= 3 and len(args) % 2 == 1:
+                replacement = self._inline_sumifs(args)
+            else:
+                replacement = f"sumIfs({', '.join(args)})"
+            expr = expr[:match.start()] + replacement + expr[close_idx + 1:]
+            match = _SUMIFS_CALL_PATTERN.search(expr, match.start() + len(replacement))
         return expr
 
-    def _replace_operators(self, expr: str) -> str:
-        expr = expr.replace("^", "**")
-        expr = expr.replace("&", "+")
-        expr = expr.replace("<>", "!=")
-        expr = expr.replace(">=", "__GE__").replace("<=", "__LE__")
-        expr = expr.replace("=", "==")
-        expr = expr.replace("__GE__", ">=").replace("__LE__", "<=")
-        expr = re.sub(r"(\\d+(?:\\.\\d+)?)%", r"(\\1/100)", expr)
-        return expr
+    def _split_call_args(self, expr: str, open_idx: int) -> Tuple[Optional[List[str]], int]:
+        args: List[str] = []
+        depth = 0
+        in_string = False
+        arg_start = open_idx + 1
+        for idx in range(open_idx + 1, len(expr)):
+            char = expr[idx]
+            if in_string:
+                if char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "([":
+                depth += 1
+            elif char in ")]":
+                if depth == 0:
+                    args.append(expr[arg_start:idx].strip())
+                    return args, idx
+                depth -= 1
+            elif char == "," and depth == 0:
+                args.append(expr[arg_start:idx].strip())
+                arg_start = idx + 1
+        return None, -1
+
+    def _inline_sumifs(self, args: List[str]) -> str:
+        pair_count = (len(args) - 1) // 2
+        params = ["sums: unknown[]"]
+        call_args = [f"flatten([{args[0]}])"]
+        for k in range(pair_count):
+            params.append(f"r{k}: unknown[]")
+            params.append(f"t{k}: (value: unknown) => boolean")
+            call_args.append(f"flatten([{args[1 + 2 * k]}])")
+            call_args.append(f"compileCriteria({args[2 + 2 * k]})")
+        condition = " && ".join(f"t{k}(r{k}[i])" for k in range(pair_count))
+        body = (
+            "{ let total = 0; for (let i = 0; i < sums.length; i += 1) { "
+            f"if ({condition}) total += toNumber(sums[i]); "
+            "} return total; }"
+        )
+        return f"(({', '.join(params)}) => {body})({', '.join(call_args)})"
+
+    def _token_sheet(self, sheet_group: Optional[str], default_sheet: str) -> str:
+        if not sheet_group:
+            return default_sheet
+        return sheet_group[:-1].strip() or default_sheet
+
+    def _range_replacement(self, match, expr: str, default_sheet: str) -> str:
+        sheet = self._token_sheet(match.group("range_sheet"), default_sheet)
+        start = match.group("start").replace("$", "")
+        end = match.group("end").replace("$", "")
+        if not sheet:
+            return f'unsupportedRange("{start}:{end}")'
+        rows = self._expand_range(sheet, start, end, limit=200)
+        if rows is None:
+            return f'unsupportedRange("{sheet}!{start}:{end}")'
+        window = expr[max(0, match.start() - 24):match.start()]
+        numeric = _NUMERIC_AGGREGATE_PATTERN.search(window) is not None
+        return self._range_literal(rows, numeric)
+
+    def _range_literal(self, rows: Tuple[Tuple[str, ...], ...], numeric: bool) -> str:
+        """Emit a JS literal for an expanded range.
+
+        Ranges passed straight to SUM/AVERAGE/MIN/MAX are coerced once into a
+        Float64Array; other single-row or single-column ranges become a flat
+        array tagged with flatRange so flatten() can return it without a walk,
+        and two-dimensional ranges keep their row structure for lookups.
+        """
+        if numeric:
+            values = ", ".join(
+                f'getValueNum("{addr}", inputs)' for row in rows for addr in row
+            )
+            return f"new Float64Array([{values}])"
+        if len(rows) == 1 or all(len(row) == 1 for row in rows):
+            values = ", ".join(
+                f'getValue("{addr}", inputs)' for row in rows for addr in row
+            )
+            return f"flatRange([{values}])"
+        return "[" + ", ".join(
+            "[" + ", ".join(f'getValue("{addr}", inputs)' for addr in row) + "]"
+            for row in rows
+        ) + "]"
 
     def _expand_range(
         self, sheet: str, start: str, end: str, limit: int = 200
-    ) -> Optional[List[List[str]]]:
-        try:
-            start_row, start_col = coordinate_to_tuple(start)
-            end_row, end_col = coordinate_to_tuple(end)
-        except ValueError:
-            return None
-        min_row = min(start_row, end_row)
-        max_row = max(start_row, end_row)
-        min_col = min(start_col, end_col)
-        max_col = max(start_col, end_col)
-        total = (max_row - min_row + 1) * (max_col - min_col + 1)
-        if total > limit:
-            return None
-        rows: List[List[str]] = []
-        for row in range(min_row, max_row + 1):
-            row_values: List[str] = []
-            for col in range(min_col, max_col + 1):
-                row_values.append(f"{sheet}!{self._col_letter(col)}{row}")
-            rows.append(row_values)
-        return rows
+    ) -> Optional[Tuple[Tuple[str, ...], ...]]:
+        return _expand_range_cached(sheet, start, end, limit)
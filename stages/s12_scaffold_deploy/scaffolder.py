@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import List, Tuple
 
 from config import settings
 from core.exceptions import StageError
@@ -72,15 +75,15 @@ class Scaffolder(Stage[GeneratedProject, ScaffoldResult]):
         if not input_data.files or not isinstance(input_data.files, dict):
             raise StageError(self.stage_number, "GeneratedProject.files is empty or invalid")
 
-        project_root = project_dir.resolve()
-        written = 0
+        # project_dir is built from a resolved base and was just created, so a
+        # lexical normpath is enough to catch traversal without per-file stats.
+        pending: List[Tuple[Path, str]] = []
         for rel_path, content in input_data.files.items():
             if not isinstance(rel_path, str) or not rel_path:
                 raise StageError(self.stage_number, f"Invalid file path: {rel_path!r}")
-            target_path = (project_dir / rel_path).resolve()
-            if not str(target_path).startswith(str(project_root)):
+            target_path = Path(os.path.normpath(project_dir / rel_path))
+            if target_path == project_dir or not target_path.is_relative_to(project_dir):
                 raise StageError(self.stage_number, f"Path traversal detected: {rel_path}")
-            target_path.parent.mkdir(parents=True, exist_ok=True)
             if content is None:
                 content = ""
             if not isinstance(content, str):
@@ -88,10 +91,24 @@ class Scaffolder(Stage[GeneratedProject, ScaffoldResult]):
                     self.stage_number,
                     f"File content must be string for {rel_path}, got {type(content).__name__}",
                 )
-            target_path.write_text(content, encoding="utf-8")
-            written += 1
+            pending.append((target_path, content))
 
-        if written == 0:
+        if not pending:
             raise StageError(self.stage_number, "No files were written")
 
+        # Create each leaf directory once (makedirs covers its ancestors), then
+        # overlap the file writes.
+        parents = {target_path.parent for target_path, _ in pending}
+        parents.discard(project_dir)
+        ancestors = {ancestor for parent in parents for ancestor in parent.parents}
+        for parent in parents - ancestors:
+            os.makedirs(parent, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+            list(executor.map(self._write_file, pending))
+
         return project_dir
+
+    @staticmethod
+    def _write_file(item: Tuple[Path, str]) -> None:
+        target_path, content = item
+        target_path.write_text(content, encoding="utf-8")
@@ -1,6 +1,7 @@
 """Stage 1: Content Classification"""
 
 from datetime import datetime
+from typing import Any, Optional
 from core.interfaces import Stage
 from core.models import ReceptionResult, ContentClassification
 from core.enums import ContentType, Domain, NarrativeContentType
@@ -11,6 +12,18 @@ from llm.prompts import ClassificationPrompt
 from config import settings
 
 
+def _parse_iso_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 string from the LLM, accepting a trailing 'Z' for UTC"""
+    if not value or not isinstance(value, str):
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 class Classifier(Stage[ReceptionResult, ContentClassification]):
     """Stage 1: Classify content type and domain (or narrative_content_type for narrative path)"""
     
@@ -55,18 +68,8 @@ class Classifier(Stage[ReceptionResult, ContentClassification]):
             result = self.prompt_builder.parse_response(response)
             
             # Parse dates if present
-            time_start = None
-            time_end = None
-            if result.get("time_period_start"):
-                try:
-                    time_start = datetime.fromisoformat(result["time_period_start"].replace('Z', '+00:00'))
-                except Exception:
-                    pass
-            if result.get("time_period_end"):
-                try:
-                    time_end = datetime.fromisoformat(result["time_period_end"].replace('Z', '+00:00'))
-                except Exception:
-                    pass
+            time_start = _parse_iso_datetime(result.get("time_period_start"))
+            time_end = _parse_iso_datetime(result.get("time_period_end"))
             
             # Parse narrative_content_type for narrative path
             narrative_content_type = None
@@ -94,9 +97,10 @@ class Classifier(Stage[ReceptionResult, ContentClassification]):
     
     def _build_preview_text(self, preview) -> str:
         """Build text preview from sheet preview"""
-        lines = []
-        for row in preview.preview_rows[:50]:  # More rows for narrative
-            line = " | ".join(str(cell)[:80] if cell else "" for cell in row)
-            lines.append(line)
-        return "\n".join(lines)
+        # Rows are short and may be ragged, so a single joined generator beats
+        # round-tripping through a DataFrame/ndarray here.
+        return "\n".join(
+            " | ".join([str(cell)[:80] if cell else "" for cell in row])
+            for row in preview.preview_rows[:50]  # More rows for narrative
+        )
 
@@ -1,7 +1,8 @@
 """Stage 2: Structure Inference"""
 
+import asyncio
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from core.interfaces import Stage
 from core.models import ReceptionResult, StructureResult, SheetStructure, ColumnInference, SheetRelationship
@@ -9,6 +10,7 @@ from core.enums import DataType, SemanticRole
 from core.exceptions import StageError
 from llm.client import LLMClient
 from llm.prompts import StructurePrompt
+from config import settings
 
 
 class StructureInferrer(Stage[ReceptionResult, StructureResult]):
@@ -31,87 +33,108 @@ class StructureInferrer(Stage[ReceptionResult, StructureResult]):
     
     async def execute(self, input_data: ReceptionResult) -> StructureResult:
         """Execute structure inference"""
-        sheets = []
         relationships = []
         
-        for preview in input_data.previews:
-            raw = input_data.raw_data.get(preview.sheet_name)
-            # Narrative: raw is str; structured: raw is DataFrame
-            if raw is None:
-                continue
-            if isinstance(raw, str):
-                # Text document: create minimal structure for narrative path
-                sheet_struct = SheetStructure(
-                    sheet_name=preview.sheet_name,
-                    columns=[ColumnInference(
-                        original_name="content",
-                        canonical_name="content",
-                        data_type=DataType.STRING,
-                        semantic_role=SemanticRole.UNKNOWN,
-                        sample_values=[],
-                    )],
-                    grain_description="Document paragraphs/lines",
-                    row_count=len([l for l in raw.splitlines() if l.strip()]) or 1,
-                    primary_key_candidates=[],
-                )
-                sheets.append(sheet_struct)
-                continue
-            if not isinstance(raw, pd.DataFrame):
-                continue
-            df = raw
+        # Sheets are independent, so overlap their LLM round-trips while
+        # keeping the result order aligned with the previews. The task group
+        # cancels the remaining sheets as soon as one of them fails.
+        semaphore = asyncio.Semaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._infer_sheet(
+                        preview, input_data.raw_data.get(preview.sheet_name), semaphore
+                    ))
+                    for preview in input_data.previews
+                ]
+        except ExceptionGroup as eg:
+            # Surface the original error so callers still catch StageError;
+            # the group itself adds nothing to the traceback
+            raise eg.exceptions[0] from None
+        results = [task.result() for task in tasks]
+        sheets = [sheet for sheet in results if sheet is not None]
+        
+        return StructureResult(sheets=sheets, sheet_relationships=relationships)
+    
+    async def _infer_sheet(
+        self,
+        preview,
+        raw: Any,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[SheetStructure]:
+        """Infer the structure of a single sheet"""
+        # Narrative: raw is str; structured: raw is DataFrame
+        if raw is None:
+            return None
+        if isinstance(raw, str):
+            # Text document: create minimal structure for narrative path
+            return SheetStructure(
+                sheet_name=preview.sheet_name,
+                columns=[ColumnInference(
+                    original_name="content",
+                    canonical_name="content",
+                    data_type=DataType.STRING,
+                    semantic_role=SemanticRole.UNKNOWN,
+                    sample_values=[],
+                )],
+                grain_description="Document paragraphs/lines",
+                row_count=len([l for l in raw.splitlines() if l.strip()]) or 1,
+                primary_key_candidates=[],
+            )
+        if not isinstance(raw, pd.DataFrame):
+            return None
+        df = raw
 
-            # Build context for LLM
-            column_preview = ", ".join([str(c) for c in df.columns[:10]])
-            sample_data = df.head(10).to_string(max_rows=10, max_cols=10)
-            
-            context = {
-                "sheet_name": preview.sheet_name,
-                "column_count": len(df.columns),
-                "row_count": len(df),
-                "column_preview": column_preview,
-                "sample_data": sample_data
-            }
-            
-            prompt = self.prompt_builder.build_prompt(context)
+        # Build context for LLM
+        sample_slice = df.iloc[:10, :10]
+        column_preview = ", ".join([str(c) for c in sample_slice.columns])
+        sample_data = sample_slice.to_csv(sep="|", index=False)
+        
+        context = {
+            "sheet_name": preview.sheet_name,
+            "column_count": len(df.columns),
+            "row_count": len(df),
+            "column_preview": column_preview,
+            "sample_data": sample_data
+        }
+        
+        prompt = self.prompt_builder.build_prompt(context)
+        async with semaphore:
             response = await self.llm.complete(prompt)
-            result = self.prompt_builder.parse_response(response)
+        result = self.prompt_builder.parse_response(response)
+        
+        # Build column inferences
+        columns = []
+        for col_data in result.get("columns", []):
+            # Handle data type enum conversion
+            data_type_str = col_data.get("data_type", "string")
+            try:
+                data_type = DataType(data_type_str)
+            except ValueError:
+                data_type = DataType.STRING
             
-            # Build column inferences
-            columns = []
-            for col_data in result.get("columns", []):
-                # Handle data type enum conversion
-                data_type_str = col_data.get("data_type", "string")
-                try:
-                    data_type = DataType(data_type_str)
-                except ValueError:
-                    data_type = DataType.STRING
-                
-                # Handle semantic role enum conversion
-                role_str = col_data.get("semantic_role", "unknown")
-                try:
-                    semantic_role = SemanticRole(role_str)
-                except ValueError:
-                    semantic_role = SemanticRole.UNKNOWN
-                
-                col_inf = ColumnInference(
-                    original_name=col_data.get("original_name", ""),
-                    canonical_name=col_data.get("canonical_name", ""),
-                    data_type=data_type,
-                    semantic_role=semantic_role,
-                    sample_values=col_data.get("sample_values", []),
-                    null_percentage=col_data.get("null_percentage", 0.0),
-                    unique_count=col_data.get("unique_count", 0)
-                )
-                columns.append(col_inf)
+            # Handle semantic role enum conversion
+            role_str = col_data.get("semantic_role", "unknown")
+            try:
+                semantic_role = SemanticRole(role_str)
+            except ValueError:
+                semantic_role = SemanticRole.UNKNOWN
             
-            sheet_struct = SheetStructure(
-                sheet_name=preview.sheet_name,
-                columns=columns,
-                grain_description=result.get("grain_description", ""),
-                row_count=len(df),
-                primary_key_candidates=result.get("primary_key_candidates", [])
+            col_inf = ColumnInference(
+                original_name=col_data.get("original_name", ""),
+                canonical_name=col_data.get("canonical_name", ""),
+                data_type=data_type,
+                semantic_role=semantic_role,
+                sample_values=col_data.get("sample_values", []),
+                null_percentage=col_data.get("null_percentage", 0.0),
+                unique_count=col_data.get("unique_count", 0)
             )
-            sheets.append(sheet_struct)
+            columns.append(col_inf)
         
-        return StructureResult(sheets=sheets, sheet_relationships=relationships)
-
+        return SheetStructure(
+            sheet_name=preview.sheet_name,
+            columns=columns,
+            grain_description=result.get("grain_description", ""),
+            row_count=len(df),
+            primary_key_candidates=result.get("primary_key_candidates", [])
+        )
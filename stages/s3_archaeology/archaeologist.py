@@ -1,7 +1,9 @@
 """Stage 3: Data Archaeology"""
 
+import asyncio
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 from core.interfaces import Stage
 from core.models import (
@@ -10,6 +12,8 @@ from core.models import (
 from core.exceptions import StageError
 from llm.client import LLMClient
 from llm.prompts import ArchaeologyPrompt
+from utils import llm_cache
+from utils.excel import column_index, column_letter
 from utils.synonyms import normalize_column_name
 from config import settings
 
@@ -42,106 +46,139 @@ class Archaeologist(Stage[Dict[str, Any], ArchaeologyResult]):
         reception: ReceptionResult = input_data["reception"]
         structure: StructureResult = input_data.get("structure")
         
+        # Sheets are independent, so overlap their LLM round-trips while
+        # keeping maps and cleaned data in preview order. The task group
+        # cancels the remaining sheets as soon as one of them fails.
+        semaphore = asyncio.Semaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._process_sheet(
+                        preview, reception.raw_data.get(preview.sheet_name), semaphore
+                    ))
+                    for preview in reception.previews
+                ]
+        except ExceptionGroup as eg:
+            # Surface the original error so callers still catch StageError;
+            # the group itself adds nothing to the traceback
+            raise eg.exceptions[0] from None
+        results = [task.result() for task in tasks]
+        
         maps = []
         cleaned_data = {}
-        
-        for preview in reception.previews:
-            # Get raw DataFrame
-            df = reception.raw_data.get(preview.sheet_name)
-            if df is None or not isinstance(df, pd.DataFrame):
+        for processed in results:
+            if processed is None:
                 continue
-            
-            # Build snapshot for LLM
-            snapshot = self._build_snapshot(df)
-            
-            # LLM analysis
-            context = {
-                "sheet_name": preview.sheet_name,
-                "total_rows": len(df),
-                "total_cols": len(df.columns),
-                "preview_rows": min(len(df), settings.ARCHAEOLOGY_MAX_PREVIEW_ROWS),
-                "snapshot": snapshot
-            }
-            
-            prompt = self.prompt_builder.build_prompt(context)
-            response = await self.llm.complete(prompt)
-            result = self.prompt_builder.parse_response(response)
-            
-            # Build archaeology map
-            # Handle None values - .get() only uses default if key doesn't exist, not if value is None
-            data_start_row = result.get("data_start_row")
-            if data_start_row is None:
-                data_start_row = 1
-            
-            arch_map = ArchaeologyMap(
-                sheet_name=preview.sheet_name,
-                header_row=result.get("header_row"),
-                data_start_row=data_start_row,
-                data_end_row=result.get("data_end_row"),
-                noise_rows=result.get("noise_rows", []),
-                noise_columns=result.get("noise_columns", []),
-                total_rows=result.get("total_rows", []),
-                has_header=result.get("has_header", True),
-                confidence=result.get("confidence", 0.5),
-                llm_reasoning=result.get("reasoning", "")
-            )
-            
-            # Extract clean data
-            clean_df = self._extract_clean_data(df, arch_map)
-            
-            # Normalize column names
-            clean_df = self._normalize_columns(clean_df)
-            
+            arch_map, clean_df = processed
             maps.append(arch_map)
-            cleaned_data[preview.sheet_name] = clean_df
+            cleaned_data[arch_map.sheet_name] = clean_df
         
         return ArchaeologyResult(maps=maps, cleaned_data=cleaned_data)
     
+    async def _process_sheet(
+        self,
+        preview,
+        df: Any,
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Tuple[ArchaeologyMap, pd.DataFrame]]:
+        """Locate and extract the clean data of a single sheet"""
+        if df is None or not isinstance(df, pd.DataFrame):
+            return None
+        
+        # Build snapshot for LLM
+        snapshot = self._build_snapshot(df)
+        
+        # LLM analysis
+        context = {
+            "sheet_name": preview.sheet_name,
+            "total_rows": len(df),
+            "total_cols": len(df.columns),
+            "preview_rows": min(len(df), settings.ARCHAEOLOGY_MAX_PREVIEW_ROWS),
+            "snapshot": snapshot
+        }
+        
+        # Identical snapshots (re-runs, sheets sharing a layout) reuse the
+        # earlier response instead of another LLM round-trip. The cache is
+        # sqlite, so keep its I/O off the loop the other sheets are using.
+        cache_key = llm_cache.make_key(
+            self.prompt_builder.PROMPT_VERSION, self.llm.model_signature(), snapshot
+        )
+        result = None
+        response = await asyncio.to_thread(llm_cache.get, cache_key)
+        if response is not None:
+            try:
+                result = self.prompt_builder.parse_response(response)
+            except Exception:
+                # Unparseable entry; drop it and ask the LLM again
+                await asyncio.to_thread(llm_cache.delete, cache_key)
+        if result is None:
+            prompt = self.prompt_builder.build_prompt_blocks(context)
+            async with semaphore:
+                response = await self.llm.complete(prompt)
+            result = self.prompt_builder.parse_response(response)
+            # Only responses that parse are worth replaying
+            await asyncio.to_thread(llm_cache.put, cache_key, response)
+        
+        # Build archaeology map
+        # Handle None values - .get() only uses default if key doesn't exist, not if value is None
+        data_start_row = result.get("data_start_row")
+        if data_start_row is None:
+            data_start_row = 1
+        
+        arch_map = ArchaeologyMap(
+            sheet_name=preview.sheet_name,
+            header_row=result.get("header_row"),
+            data_start_row=data_start_row,
+            data_end_row=result.get("data_end_row"),
+            noise_rows=result.get("noise_rows", []),
+            noise_columns=result.get("noise_columns", []),
+            total_rows=result.get("total_rows", []),
+            has_header=result.get("has_header", True),
+            confidence=result.get("confidence", 0.5),
+            llm_reasoning=result.get("reasoning", "")
+        )
+        
+        # Extract clean data
+        clean_df = self._extract_clean_data(df, arch_map)
+        
+        # Normalize column names
+        clean_df = self._normalize_columns(clean_df)
+        
+        return arch_map, clean_df
+    
     def _build_snapshot(self, df: pd.DataFrame) -> str:
         """Build text snapshot for LLM"""
-        preview = df.head(settings.ARCHAEOLOGY_MAX_PREVIEW_ROWS).copy()
+        preview = df.head(settings.ARCHAEOLOGY_MAX_PREVIEW_ROWS)
         
         # Generate column letters
-        col_letters = []
-        for i in range(len(preview.columns)):
-            result = ""
-            n = i
-            while n >= 0:
-                result = chr(n % 26 + ord('A')) + result
-                n = n // 26 - 1
-            col_letters.append(result)
-        
-        # Calculate column widths
-        col_widths = []
-        for i in range(len(preview.columns)):
-            max_width = max(
-                len(col_letters[i]),
-                max((len(str(v)[:25]) for v in preview.iloc[:, i]), default=0)
-            )
-            col_widths.append(min(max_width, 25))
-        
-        lines = []
-        
-        # Header
+        col_letters = [column_letter(i) for i in range(1, len(preview.columns) + 1)]
+        
+        # Stringify every cell once from a plain object array; per-cell
+        # iloc lookups dominate the cost of this method otherwise
+        values = preview.to_numpy(dtype=object)
+        blank = pd.isna(values)
+        cell_strs = [
+            ["" if is_blank else str(val)[:25] for val, is_blank in zip(row, blank_row)]
+            for row, blank_row in zip(values, blank)
+        ]
+        
+        # Calculate column widths from the transposed cell strings
+        col_widths = [len(letters) for letters in col_letters]
+        for i, column in enumerate(zip(*cell_strs)):
+            col_widths[i] = min(max(col_widths[i], max(map(len, column))), 25)
+        
         header = "ROW  │ " + " │ ".join(
-            col_letters[i].center(col_widths[i])
-            for i in range(len(col_letters))
+            letters.center(width) for letters, width in zip(col_letters, col_widths)
+        )
+        # One format string per snapshot lays out a whole row in a single
+        # C-level call instead of padding and joining cell by cell
+        row_format = "{:>4} │ " + " │ ".join(f"{{:<{width}}}" for width in col_widths)
+        
+        lines = [header, "─" * len(header)]
+        lines.extend(
+            row_format.format(row_idx, *row)
+            for row_idx, row in enumerate(cell_strs, 1)
         )
-        lines.append(header)
-        lines.append("─" * len(header))
-        
-        # Data rows
-        for row_idx in range(len(preview)):
-            row_num = str(row_idx + 1).rjust(4)
-            cells = []
-            for col_idx in range(len(preview.columns)):
-                val = preview.iloc[row_idx, col_idx]
-                if pd.isna(val):
-                    cell_str = ""
-                else:
-                    cell_str = str(val)[:25]
-                cells.append(cell_str.ljust(col_widths[col_idx]))
-            lines.append(f"{row_num} │ " + " │ ".join(cells))
         
         if len(df) > settings.ARCHAEOLOGY_MAX_PREVIEW_ROWS:
             lines.append(f"... ({len(df) - settings.ARCHAEOLOGY_MAX_PREVIEW_ROWS} more rows)")
@@ -158,35 +195,40 @@ class Archaeologist(Stage[Dict[str, Any], ArchaeologyResult]):
         total_rows_idx = [r - 1 for r in arch_map.total_rows]
         
         # Convert column letters to indices
-        noise_col_indices = []
-        for letter in arch_map.noise_columns:
-            idx = 0
-            for char in letter.upper():
-                idx = idx * 26 + (ord(char) - ord('A') + 1)
-            noise_col_indices.append(idx - 1)
+        noise_col_indices = [column_index(letter) - 1 for letter in arch_map.noise_columns]
         
         # Determine rows to keep
         rows_to_exclude = set(noise_rows_idx + total_rows_idx)
         if header_idx is not None:
             rows_to_exclude.add(header_idx)
         
-        keep_rows = [
-            i for i in range(data_start_idx, data_end_idx)
-            if i not in rows_to_exclude
+        # Keep rows as a slice of the data range; only fall back to a mask
+        # when noise/total/header rows actually fall inside it
+        data_start_idx = max(data_start_idx, 0)
+        data_end_idx = max(min(data_end_idx, len(df)), data_start_idx)
+        clean_df = df.iloc[data_start_idx:data_end_idx]
+        excluded = [
+            i - data_start_idx for i in rows_to_exclude
+            if data_start_idx <= i < data_end_idx
         ]
+        if excluded:
+            keep_row_mask = np.ones(len(clean_df), dtype=bool)
+            keep_row_mask[excluded] = False
+            clean_df = clean_df.iloc[keep_row_mask]
         
         # Determine columns to keep
-        keep_cols = [
-            i for i in range(len(df.columns))
-            if i not in noise_col_indices
-        ]
-        
-        # Extract subset
-        clean_df = df.iloc[keep_rows, keep_cols].copy()
+        keep_col_mask = None
+        noise_cols = [i for i in noise_col_indices if 0 <= i < len(df.columns)]
+        if noise_cols:
+            keep_col_mask = np.ones(len(df.columns), dtype=bool)
+            keep_col_mask[noise_cols] = False
+            clean_df = clean_df.iloc[:, keep_col_mask]
         
         # Set header if present
         if arch_map.has_header and header_idx is not None:
-            header_values = df.iloc[header_idx, keep_cols].values
+            header_values = df.iloc[header_idx].to_numpy()
+            if keep_col_mask is not None:
+                header_values = header_values[keep_col_mask]
             clean_df.columns = [str(v) for v in header_values]
         
         # Remove completely empty rows
@@ -211,7 +253,8 @@ class Archaeologist(Stage[Dict[str, Any], ArchaeologyResult]):
             
             normalized.append(norm)
         
-        df_copy = df.copy()
-        df_copy.columns = normalized
-        return df_copy
+        # Callers pass a frame freshly built by _extract_clean_data, so it is
+        # safe to relabel it in place rather than copying the data
+        df.columns = normalized
+        return df
 
@@ -1,12 +1,13 @@
 """Stage 4: Cross-Sheet Reconciliation"""
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
 from core.interfaces import Stage
 from core.models import ArchaeologyResult, ReconciliationResult, CanonicalSchema, ColumnMapping, ColumnInference
 from core.exceptions import StageError
-from utils.fuzzy import fuzzy_match_column
+from utils.fuzzy import fuzzy_match_columns
 from utils.synonyms import COLUMN_SYNONYMS
 
 
@@ -46,38 +47,52 @@ class Reconciler(Stage[ArchaeologyResult, ReconciliationResult]):
         # Create mappings
         mappings = []
         canonical_columns = []
+        seen_canonical = set()
         
-        for sheet_name, df in input_data.cleaned_data.items():
-            for col in df.columns:
-                # Try to find canonical match
-                canonical = fuzzy_match_column(str(col), COLUMN_SYNONYMS) or str(col).lower()
-                
-                mapping = ColumnMapping(
-                    sheet_name=sheet_name,
-                    original_column=str(col),
-                    canonical_column=canonical,
-                    confidence=0.8 if canonical != str(col).lower() else 1.0
-                )
-                mappings.append(mapping)
-                
-                if canonical not in [c.original_name for c in canonical_columns]:
-                    from core.enums import DataType, SemanticRole
-                    canonical_columns.append(ColumnInference(
-                        original_name=canonical,
-                        canonical_name=canonical,
-                        data_type=DataType.STRING,  # Default, will be inferred later
-                        semantic_role=SemanticRole.UNKNOWN  # Default, will be inferred later
-                    ))
+        # Score every sheet's columns against the synonyms in one batch
+        sheet_columns = [
+            (sheet_name, str(col))
+            for sheet_name, df in input_data.cleaned_data.items()
+            for col in df.columns
+        ]
+        matches = fuzzy_match_columns([col for _, col in sheet_columns], COLUMN_SYNONYMS)
         
-        # Stack all dataframes
-        unified_dfs = []
-        for sheet_name, df in input_data.cleaned_data.items():
-            df_copy = df.copy()
-            df_copy['_source_sheet'] = sheet_name
-            df_copy['_source_row'] = range(len(df_copy))
-            unified_dfs.append(df_copy)
+        for (sheet_name, col), match in zip(sheet_columns, matches):
+            # Try to find canonical match
+            canonical = match or col.lower()
+            
+            mapping = ColumnMapping(
+                sheet_name=sheet_name,
+                original_column=col,
+                canonical_column=canonical,
+                confidence=0.8 if canonical != col.lower() else 1.0
+            )
+            mappings.append(mapping)
+            
+            if canonical not in seen_canonical:
+                seen_canonical.add(canonical)
+                from core.enums import DataType, SemanticRole
+                canonical_columns.append(ColumnInference(
+                    original_name=canonical,
+                    canonical_name=canonical,
+                    data_type=DataType.STRING,  # Default, will be inferred later
+                    semantic_role=SemanticRole.UNKNOWN  # Default, will be inferred later
+                ))
         
-        unified = pd.concat(unified_dfs, ignore_index=True)
+        # Stack all dataframes, then add the tracking columns once on the
+        # result instead of copying every sheet to attach them. Sheets with
+        # identical columns take pandas' no-reindex path; differing schemas
+        # are outer-aligned by concat itself, so no per-sheet copy is needed.
+        sheet_names = list(input_data.cleaned_data.keys())
+        lengths = [len(df) for df in input_data.cleaned_data.values()]
+        unified = pd.concat(list(input_data.cleaned_data.values()), ignore_index=True)
+        unified['_source_sheet'] = pd.Categorical.from_codes(
+            np.repeat(np.arange(len(sheet_names)), lengths),
+            categories=sheet_names
+        )
+        unified['_source_row'] = np.concatenate(
+            [np.arange(length, dtype=np.int32) for length in lengths]
+        )
         
         return ReconciliationResult(
             canonical_schema=CanonicalSchema(
@@ -1,5 +1,6 @@
 """Stage 5: Schema Design & ETL"""
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Dict, Any, Union
@@ -7,13 +8,21 @@ from typing import Dict, Any, Union
 from core.interfaces import Stage
 from core.models import (
     ArchaeologyResult, ReconciliationResult, ETLResult,
-    PostgresTable, PostgresColumn, ValidationIssue
+    PostgresTable, PostgresColumn, ValidationIssuesFrame
 )
 from core.enums import ValidationIssueType, DataType
 from core.exceptions import StageError
 from db import DatabaseManager, SchemaManager, DataLoader
 from config import settings
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 class ETLManager(Stage[Union[ArchaeologyResult, ReconciliationResult, Dict[str, Any]], ETLResult]):
     """Stage 5: Design schema, transform, validate, and persist"""
@@ -77,7 +86,7 @@ class ETLManager(Stage[Union[ArchaeologyResult, ReconciliationResult, Dict[str,
         # Save data file
         output_dir = settings.get_output_path("data")
         data_file = output_dir / f"{table_name}.csv"
-        transformed_df.to_csv(data_file, index=False)
+        self._write_csv(transformed_df, data_file)
         
         # Generate load SQL
         load_sql = f"\\copy {table_name} FROM '{data_file}' WITH CSV HEADER;"
@@ -99,9 +108,10 @@ class ETLManager(Stage[Union[ArchaeologyResult, ReconciliationResult, Dict[str,
             schema_sql=schema_sql,
             data_file_path=str(data_file),
             load_sql=load_sql,
-            validation_issues=issues,
+            issues_frame=issues,
             rows_valid=valid_rows,
-            rows_invalid=invalid_rows
+            rows_invalid=invalid_rows,
+            dataframe=transformed_df
         )
     
     def _design_schema(self, df: pd.DataFrame, table_name: str) -> PostgresTable:
@@ -135,12 +145,15 @@ class ETLManager(Stage[Union[ArchaeologyResult, ReconciliationResult, Dict[str,
         elif pd.api.types.is_bool_dtype(series):
             return "BOOLEAN"
         else:
-            # Check length for VARCHAR vs TEXT
-            max_len = series.astype(str).str.len().max()
-            if max_len <= 255:
-                return "VARCHAR(255)"
-            else:
+            # Check length for VARCHAR vs TEXT, stopping at the first value
+            # that is too long instead of stringifying the whole column
+            if series.empty:
                 return "TEXT"
+            for value in series.to_numpy():
+                length = len(value) if isinstance(value, str) else len(str(value))
+                if length > 255:
+                    return "TEXT"
+            return "VARCHAR(255)"
     
     def _transform_data(self, df: pd.DataFrame, schema: PostgresTable) -> pd.DataFrame:
         """Transform data to match schema"""
@@ -168,26 +181,65 @@ class ETLManager(Stage[Union[ArchaeologyResult, ReconciliationResult, Dict[str,
         
         return df_copy
     
-    def _validate_data(self, df: pd.DataFrame, schema: PostgresTable) -> list[ValidationIssue]:
+    def _validate_data(self, df: pd.DataFrame, schema: PostgresTable) -> ValidationIssuesFrame:
         """Validate data against schema"""
-        issues = []
-        
-        for idx, row in df.iterrows():
-            for col_def in schema.columns:
-                if col_def.name in df.columns:
-                    value = row[col_def.name]
-                    
-                    # Check nulls
-                    if pd.isna(value) and not col_def.nullable:
-                        issues.append(ValidationIssue(
-                            row_number=int(idx),
-                            column=col_def.name,
-                            value=value,
-                            issue_type=ValidationIssueType.NULL_VIOLATION,
-                            message=f"Null value in non-nullable column"
-                        ))
-        
-        return issues
+        # Only non-nullable columns can produce null violations
+        checked = [
+            col_def.name for col_def in schema.columns
+            if not col_def.nullable and col_def.name in df.columns
+        ]
+        if not checked:
+            return ValidationIssuesFrame()
+        
+        # Scan every checked column at once; np.nonzero walks the mask in
+        # row-major order, so issues keep the row-then-column ordering.
+        subset = df[checked]
+        row_positions, col_positions = np.nonzero(subset.isna().to_numpy())
+        # Gather the offending values column by column, touching only
+        # columns that actually have issues
+        values = np.empty(len(row_positions), dtype=object)
+        for col_pos in np.unique(col_positions):
+            selected = col_positions == col_pos
+            column_values = subset.iloc[:, col_pos].to_numpy(dtype=object)
+            values[selected] = column_values[row_positions[selected]]
+        
+        return ValidationIssuesFrame(
+            rows=np.asarray(df.index[row_positions], dtype=np.int64),
+            column_codes=col_positions.astype(np.int32),
+            columns=checked,
+            values=values,
+            kind_codes=np.zeros(len(row_positions), dtype=np.int8),
+            kinds=[(ValidationIssueType.NULL_VIOLATION, "Null value in non-nullable column")]
+        )
+    
+    def _write_csv(self, df: pd.DataFrame, path: Path) -> None:
+        """Write the data file, using pyarrow's multithreaded writer when available"""
+        if PYARROW_AVAILABLE:
+            try:
+                table = self._blank_empty_strings(pa.Table.from_pandas(df, preserve_index=False))
+                pa_csv.write_csv(
+                    table,
+                    str(path),
+                    write_options=pa_csv.WriteOptions(include_header=True),
+                )
+                return
+            except (pa.ArrowException, TypeError, ValueError):
+                # Mixed-type object columns have no Arrow type and some Arrow
+                # types have no CSV rendering; let pandas (re)write the file
+                pass
+        df.to_csv(path, index=False)
+    
+    def _blank_empty_strings(self, table: "pa.Table") -> "pa.Table":
+        """Null out empty strings so COPY ... CSV still loads them as NULL"""
+        # pandas writes "" as an empty field (NULL to COPY); Arrow would quote it
+        for i, field in enumerate(table.schema):
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+                column = table.column(i)
+                table = table.set_column(
+                    i, field,
+                    pc.if_else(pc.equal(column, ""), pa.scalar(None, type=field.type), column),
+                )
+        return table
     
     def _generate_schema_sql(self, schema: PostgresTable) -> str:
         """Generate CREATE TABLE SQL"""
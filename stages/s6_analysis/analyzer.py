@@ -1,5 +1,6 @@
 """Stage 6: Analysis & Insight Generation"""
 
+import asyncio
 import pandas as pd
 from typing import Dict, Any
 import uuid
@@ -10,6 +11,7 @@ from core.enums import Domain, Severity, VisualizationType
 from core.exceptions import StageError
 from llm.client import LLMClient
 from llm.prompts import AnalysisPrompt, InsightsPrompt
+from utils import llm_cache
 from config import settings
 
 
@@ -41,8 +43,8 @@ class Analyzer(Stage[Dict[str, Any], AnalysisResult]):
         if not etl:
             return AnalysisResult(domain=domain, insights=[])
         
-        # Load data
-        df = pd.read_csv(etl.data_file_path)
+        # Load data, preferring the frame handed over by ETL to re-parsing its CSV
+        df = etl.dataframe if etl.dataframe is not None else pd.read_csv(etl.data_file_path)
         
         # Build analysis context
         context = {
@@ -53,10 +55,30 @@ class Analyzer(Stage[Dict[str, Any], AnalysisResult]):
             "data_summary": df.describe().to_string()
         }
         
-        # Get LLM analysis
-        prompt = self.analysis_prompt.build_prompt(context)
-        response = await self.llm.complete(prompt)
-        result = self.analysis_prompt.parse_response(response)
+        # Get LLM analysis; the cache is sqlite, so its I/O runs off the loop
+        cache_key = llm_cache.make_key(
+            self.analysis_prompt.PROMPT_VERSION,
+            self.llm.model_signature(),
+            context["domain"],
+            context["table_name"],
+            context["row_count"],
+            context["columns"],
+            context["data_summary"],
+        )
+        result = None
+        response = await asyncio.to_thread(llm_cache.get, cache_key)
+        if response is not None:
+            try:
+                result = self.analysis_prompt.parse_response(response)
+            except Exception:
+                # Unparseable entry; drop it and ask the LLM again
+                await asyncio.to_thread(llm_cache.delete, cache_key)
+        if result is None:
+            prompt = self.analysis_prompt.build_prompt_blocks(context)
+            response = await self.llm.complete(prompt)
+            result = self.analysis_prompt.parse_response(response)
+            # Only responses that parse are worth replaying
+            await asyncio.to_thread(llm_cache.put, cache_key, response)
         
         # Filter insights
         insights_context = {
@@ -1,7 +1,14 @@
 """Stage 7: Executive Output"""
 
+import asyncio
+import io
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from xml.sax.saxutils import escape
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 
 from core.interfaces import Stage
@@ -9,6 +16,150 @@ from core.models import AnalysisResult, OutputResult, NarrativeEvidence
 from core.exceptions import StageError
 from config import settings
 
+try:
+    import pptx
+    from pptx import Presentation
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import qn
+    PPTX_AVAILABLE = True
+except ImportError:
+    PPTX_AVAILABLE = False
+
+
+# Per-insight report blocks. Each renders to several lines ending in "\n";
+# the writer's separator then supplies the blank line between blocks.
+_TEXT_SUMMARY_TEMPLATE = "{index}. {headline}\n   {detail}\n   Implication: {implication}\n"
+_TEXT_INSIGHT_TEMPLATE = "• {headline}\n  {detail}\n{evidence}  Implication: {implication}\n"
+_TEXT_NARRATIVE_EVIDENCE = "  Evidence ({source_type}): {reference}\n"
+_TEXT_SPEAKER = "  Speaker: {speaker}\n"
+_TEXT_METRIC_EVIDENCE = "  Evidence: {metric} = {value}\n"
+_TEXT_CHANGE = "  Change: {delta_percent:.1f}%\n"
+
+_MD_SUMMARY_TEMPLATE = "{index}. **{headline}**\n   - {detail}\n   - *Implication:* {implication}\n"
+_MD_INSIGHT_TEMPLATE = "### {headline}\n\n{detail}\n\n{evidence}- **Implication:** {implication}\n"
+_MD_NARRATIVE_EVIDENCE = "- **Evidence ({source_type}):** {reference}\n"
+_MD_SPEAKER = "- **Speaker:** {speaker}\n"
+_MD_METRIC_EVIDENCE = "- **Metric:** {metric} = {value}\n"
+_MD_CHANGE = "- **Change:** {delta_percent:.1f}%\n"
+
+# Characters that Markdown would otherwise read as emphasis, code, headings,
+# table cells or inline HTML when they appear in LLM-written fields.
+_MD_ESCAPE = str.maketrans({
+    '\\': '\\\\', '*': r'\*', '_': r'\_', '`': r'\`', '#': r'\#', '|': r'\|', '<': '&lt;',
+})
+
+
+def _md(text: Optional[str]) -> str:
+    """Escape a free-text field for interpolation into the markdown report"""
+    return text.translate(_MD_ESCAPE) if text else ''
+
+
+def _render_evidence(
+    ev, narrative_tmpl: str, speaker_tmpl: str, metric_tmpl: str, change_tmpl: str,
+    quote=str,
+) -> str:
+    """Render the evidence lines of one insight with the given templates"""
+    if isinstance(ev, NarrativeEvidence):
+        text = narrative_tmpl.format(source_type=ev.source_type, reference=quote(ev.reference))
+        if ev.speaker:
+            text += speaker_tmpl.format(speaker=quote(ev.speaker))
+        return text
+    text = metric_tmpl.format(metric=quote(ev.metric), value=ev.value)
+    if ev.delta is not None:
+        text += change_tmpl.format(delta_percent=ev.delta_percent)
+    return text
+
+
+# DrawingML paragraphs for slide bodies are emitted as one XML fragment per
+# slide, mirroring what python-pptx's TextFrame/_Paragraph setters produce.
+_DRAWINGML_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_LINE_BREAK_PATTERN = re.compile("\n|\v")
+# Same control characters python-pptx escapes as "_xHHHH_" in run text
+_CONTROL_CHAR_PATTERN = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+def _escape_run_text(text: str) -> str:
+    text = _CONTROL_CHAR_PATTERN.sub(lambda match: "_x%04X_" % ord(match.group(1)), text)
+    return escape(text)
+
+
+# Decks repeat a lot of bullet text (implications, metric lines), so identical
+# paragraphs are rendered and escaped once
+@lru_cache(maxsize=4096)
+def _paragraph_xml(text: str, level: int = 0) -> str:
+    """Render one <a:p>, splitting runs on line breaks like _Paragraph.text"""
+    parts = ["<a:p>"]
+    if level:
+        parts.append(f'<a:pPr lvl="{level}"/>')
+    for idx, run_text in enumerate(_LINE_BREAK_PATTERN.split(text)):
+        if idx > 0:
+            parts.append("<a:br/>")
+        if run_text:
+            parts.append(f"<a:r><a:t>{_escape_run_text(run_text)}</a:t></a:r>")
+    parts.append("</a:p>")
+    return "".join(parts)
+
+# 10in x 7.5in slides, in EMU (914400 per inch)
+_SLIDE_WIDTH_EMU = 9144000
+_SLIDE_HEIGHT_EMU = 6858000
+
+# Bytes of python-pptx's blank template, read on first use
+_PPTX_TEMPLATE_BYTES: Optional[bytes] = None
+
+
+def _pptx_template_bytes() -> bytes:
+    global _PPTX_TEMPLATE_BYTES
+    if _PPTX_TEMPLATE_BYTES is None:
+        _PPTX_TEMPLATE_BYTES = (Path(pptx.__file__).parent / "templates" / "default.pptx").read_bytes()
+    return _PPTX_TEMPLATE_BYTES
+
+
+def _index_part_relationships(part) -> None:
+    """
+    Answer relationship lookups on a part from a dict instead of a scan
+
+    python-pptx's get_or_add rebuilds a by-type view of every relationship on
+    the part before each new one, so adding N slides costs O(N^2). The deck is
+    built fresh and never drops relationships, so an index of (reltype, target)
+    pairs stays exact. Falls back to the stock behavior on API drift.
+    """
+    try:
+        rels = part.rels
+        index = {
+            (rel.reltype, rel.target_part): rId
+            for rId, rel in rels.items()
+            if not rel.is_external
+        }
+        add_relationship = rels._add_relationship
+    except AttributeError:
+        return
+
+    def get_or_add(reltype, target_part):
+        key = (reltype, target_part)
+        rId = index.get(key)
+        if rId is None:
+            rId = index[key] = add_relationship(reltype, target_part)
+        return rId
+
+    rels.get_or_add = get_or_add
+
+
+@contextmanager
+def _atomic_target(file_path: Path) -> Iterator[Path]:
+    """
+    Yield a sibling temp path and move it over file_path once written
+
+    Readers never observe a partially written report, and a failed write
+    leaves any previous file in place.
+    """
+    tmp = file_path.with_suffix(file_path.suffix + '.tmp')
+    try:
+        yield tmp
+        os.replace(tmp, file_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 
 class OutputManager(Stage[AnalysisResult, OutputResult]):
     """Stage 7: Generate executive output (text, markdown, PowerPoint)"""
@@ -33,12 +184,20 @@ class OutputManager(Stage[AnalysisResult, OutputResult]):
         text_file = output_dir / "insights.txt"
         markdown_file = output_dir / "insights.md"
         
-        self._generate_text_output(input_data, text_file)
-        self._generate_markdown_output(input_data, markdown_file)
+        # One timestamp and domain label shared by every artifact
+        now = datetime.now()
+        domain = input_data.domain.value
+        generated_at = now.strftime('%Y-%m-%d %H:%M:%S')
         
-        # Generate PowerPoint
-        pptx_file = presentations_dir / f"presentation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"
-        self._generate_powerpoint(input_data, pptx_file)
+        pptx_file = presentations_dir / f"presentation_{now.strftime('%Y%m%d_%H%M%S')}.pptx"
+        
+        # The generators only read the analysis, so run them side by side;
+        # PowerPoint serialization is the long pole
+        await asyncio.gather(
+            asyncio.to_thread(self._generate_text_output, input_data, text_file, domain, generated_at),
+            asyncio.to_thread(self._generate_markdown_output, input_data, markdown_file, domain, generated_at),
+            asyncio.to_thread(self._generate_powerpoint, input_data, pptx_file, domain, now.strftime('%B %Y')),
+        )
         
         return OutputResult(
             text_file_path=str(text_file),
@@ -48,215 +207,215 @@ class OutputManager(Stage[AnalysisResult, OutputResult]):
             insight_count=len(input_data.insights)
         )
     
-    def _generate_text_output(self, analysis: AnalysisResult, file_path: Path):
+    def _generate_text_output(
+        self, analysis: AnalysisResult, file_path: Path, domain: str, generated_at: str
+    ):
         """Generate plain text output"""
-        lines = [
-            f"Tragaldabas Analysis Report",
-            f"Domain: {analysis.domain.value}",
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "=" * 50,
-            "EXECUTIVE SUMMARY",
-            "=" * 50,
-            ""
-        ]
+        self._write_lines(file_path, self._iter_text_lines(analysis, domain, generated_at))
+    
+    def _iter_text_lines(
+        self, analysis: AnalysisResult, domain: str, generated_at: str
+    ) -> Iterator[str]:
+        """Yield the lines of the plain text report"""
+        yield f"Tragaldabas Analysis Report"
+        yield f"Domain: {domain}"
+        yield f"Generated: {generated_at}"
+        yield ""
+        yield "=" * 50
+        yield "EXECUTIVE SUMMARY"
+        yield "=" * 50
+        yield ""
 
         # The Genius Move (Alpha Strike)
         if analysis.genius_insight and analysis.genius_insight.thesis:
             g = analysis.genius_insight
-            lines.append("THE GENIUS MOVE (Strategic Alpha)")
-            lines.append("-" * 40)
-            lines.append(f"Thesis: {g.thesis}")
+            yield "THE GENIUS MOVE (Strategic Alpha)"
+            yield "-" * 40
+            yield f"Thesis: {g.thesis}"
             if g.mechanism:
-                lines.append(f"Mechanism: {g.mechanism}")
+                yield f"Mechanism: {g.mechanism}"
             if g.market_confluence:
-                lines.append(f"Market Confluence: {g.market_confluence}")
+                yield f"Market Confluence: {g.market_confluence}"
             if g.estimated_upside:
-                lines.append(f"Estimated Upside: {g.estimated_upside}")
+                yield f"Estimated Upside: {g.estimated_upside}"
             if g.kill_switch:
-                lines.append(f"Kill Switch: {g.kill_switch}")
-            lines.append("")
+                yield f"Kill Switch: {g.kill_switch}"
+            yield ""
         
         # Top insights
         for i, insight in enumerate(analysis.insights[:5], 1):
-            lines.append(f"{i}. {insight.headline}")
-            lines.append(f"   {insight.detail}")
-            lines.append(f"   Implication: {insight.implication}")
-            lines.append("")
+            yield _TEXT_SUMMARY_TEMPLATE.format(
+                index=i, headline=insight.headline, detail=insight.detail,
+                implication=insight.implication
+            )
         
-        lines.append("=" * 50)
-        lines.append("DETAILED INSIGHTS")
-        lines.append("=" * 50)
-        lines.append("")
+        yield "=" * 50
+        yield "DETAILED INSIGHTS"
+        yield "=" * 50
+        yield ""
         
         for insight in analysis.insights:
-            lines.append(f"• {insight.headline}")
-            lines.append(f"  {insight.detail}")
-            ev = insight.evidence
-            if isinstance(ev, NarrativeEvidence):
-                lines.append(f"  Evidence ({ev.source_type}): {ev.reference}")
-                if ev.speaker:
-                    lines.append(f"  Speaker: {ev.speaker}")
-            else:
-                lines.append(f"  Evidence: {ev.metric} = {ev.value}")
-                if ev.delta is not None:
-                    lines.append(f"  Change: {ev.delta_percent:.1f}%")
-            lines.append(f"  Implication: {insight.implication}")
-            lines.append("")
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(lines))
+            yield _TEXT_INSIGHT_TEMPLATE.format(
+                headline=insight.headline,
+                detail=insight.detail,
+                evidence=_render_evidence(
+                    insight.evidence, _TEXT_NARRATIVE_EVIDENCE, _TEXT_SPEAKER,
+                    _TEXT_METRIC_EVIDENCE, _TEXT_CHANGE
+                ),
+                implication=insight.implication
+            )
     
-    def _generate_markdown_output(self, analysis: AnalysisResult, file_path: Path):
+    def _generate_markdown_output(
+        self, analysis: AnalysisResult, file_path: Path, domain: str, generated_at: str
+    ):
         """Generate markdown output"""
-        lines = [
-            f"# Tragaldabas Analysis Report",
-            "",
-            f"**Domain:** {analysis.domain.value}",
-            f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "## Executive Summary",
-            ""
-        ]
+        self._write_lines(file_path, self._iter_markdown_lines(analysis, domain, generated_at))
+    
+    def _iter_markdown_lines(
+        self, analysis: AnalysisResult, domain: str, generated_at: str
+    ) -> Iterator[str]:
+        """Yield the lines of the markdown report"""
+        yield f"# Tragaldabas Analysis Report"
+        yield ""
+        yield f"**Domain:** {domain}"
+        yield f"**Generated:** {generated_at}"
+        yield ""
+        yield "## Executive Summary"
+        yield ""
 
         # The Genius Move (Alpha Strike)
         if analysis.genius_insight and analysis.genius_insight.thesis:
             g = analysis.genius_insight
-            lines.append("### ⚡ The Genius Move (Strategic Alpha)")
-            lines.append("")
-            lines.append(f"**Thesis:** {g.thesis}")
+            yield "### ⚡ The Genius Move (Strategic Alpha)"
+            yield ""
+            yield f"**Thesis:** {_md(g.thesis)}"
             if g.mechanism:
-                lines.append(f"**Mechanism:** {g.mechanism}")
+                yield f"**Mechanism:** {_md(g.mechanism)}"
             if g.market_confluence:
-                lines.append(f"**Market Confluence:** {g.market_confluence}")
+                yield f"**Market Confluence:** {_md(g.market_confluence)}"
             if g.estimated_upside:
-                lines.append(f"**Estimated Upside:** {g.estimated_upside}")
+                yield f"**Estimated Upside:** {_md(g.estimated_upside)}"
             if g.kill_switch:
-                lines.append(f"**Kill Switch:** {g.kill_switch}")
-            lines.append("")
+                yield f"**Kill Switch:** {_md(g.kill_switch)}"
+            yield ""
         
-        for i, insight in enumerate(analysis.insights[:5], 1):
-            lines.append(f"{i}. **{insight.headline}**")
-            lines.append(f"   - {insight.detail}")
-            lines.append(f"   - *Implication:* {insight.implication}")
-            lines.append("")
+        # The top insights appear in both sections; escape their fields once
+        escaped = [
+            (_md(insight.headline), _md(insight.detail), _md(insight.implication))
+            for insight in analysis.insights
+        ]
         
-        lines.append("## Detailed Insights")
-        lines.append("")
+        for i, (headline, detail, implication) in enumerate(escaped[:5], 1):
+            yield _MD_SUMMARY_TEMPLATE.format(
+                index=i, headline=headline, detail=detail, implication=implication
+            )
         
-        for insight in analysis.insights:
-            lines.append(f"### {insight.headline}")
-            lines.append("")
-            lines.append(f"{insight.detail}")
-            lines.append("")
-            ev = insight.evidence
-            if isinstance(ev, NarrativeEvidence):
-                lines.append(f"- **Evidence ({ev.source_type}):** {ev.reference}")
-                if ev.speaker:
-                    lines.append(f"- **Speaker:** {ev.speaker}")
-            else:
-                lines.append(f"- **Metric:** {ev.metric} = {ev.value}")
-                if ev.delta is not None:
-                    lines.append(f"- **Change:** {ev.delta_percent:.1f}%")
-            lines.append(f"- **Implication:** {insight.implication}")
-            lines.append("")
+        yield "## Detailed Insights"
+        yield ""
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(lines))
+        for insight, (headline, detail, implication) in zip(analysis.insights, escaped):
+            yield _MD_INSIGHT_TEMPLATE.format(
+                headline=headline,
+                detail=detail,
+                evidence=_render_evidence(
+                    insight.evidence, _MD_NARRATIVE_EVIDENCE, _MD_SPEAKER,
+                    _MD_METRIC_EVIDENCE, _MD_CHANGE, quote=_md
+                ),
+                implication=implication
+            )
+    
+    def _write_lines(self, file_path: Path, lines: Iterator[str]):
+        """Stream newline-separated lines to a file without joining them first"""
+        with _atomic_target(file_path) as tmp, \
+                open(tmp, 'w', encoding='utf-8', buffering=1 << 19) as f:
+            write = f.write
+            first = next(lines, None)
+            if first is None:
+                return
+            write(first)
+            # Write the separator and the line separately rather than
+            # allocating a concatenated copy of every line
+            for line in lines:
+                write("\n")
+                write(line)
     
-    def _generate_powerpoint(self, analysis: AnalysisResult, file_path: Path):
+    def _generate_powerpoint(self, analysis: AnalysisResult, file_path: Path, domain: str, period: str):
         """Generate PowerPoint presentation"""
-        try:
-            from pptx import Presentation
-            from pptx.util import Inches, Pt
-            from pptx.enum.text import PP_ALIGN
-            
-            prs = Presentation()
-            prs.slide_width = Inches(10)
-            prs.slide_height = Inches(7.5)
-            
-            # Title slide
-            slide = prs.slides.add_slide(prs.slide_layouts[0])
-            title = slide.shapes.title
-            subtitle = slide.placeholders[1]
-            
-            title.text = "Tragaldabas Analysis"
-            subtitle.text = f"{analysis.domain.value.title()} Domain\n{datetime.now().strftime('%B %Y')}"
-            
-            # Summary slide
-            slide = prs.slides.add_slide(prs.slide_layouts[1])
-            title = slide.shapes.title
-            content = slide.placeholders[1]
-            
-            title.text = "Executive Summary"
-            tf = content.text_frame
-            tf.text = "Key Findings:"
-
-            # The Genius Move slide (Alpha Strike)
-            if analysis.genius_insight and analysis.genius_insight.thesis:
-                slide = prs.slides.add_slide(prs.slide_layouts[1])
-                title = slide.shapes.title
-                content = slide.placeholders[1]
-                title.text = "The Genius Move"
-                tf = content.text_frame
-                g = analysis.genius_insight
-                tf.text = g.thesis
-                if g.mechanism:
-                    p = tf.add_paragraph()
-                    p.text = g.mechanism
-                    p.level = 1
-                if g.estimated_upside:
-                    p = tf.add_paragraph()
-                    p.text = f"Upside: {g.estimated_upside}"
-                    p.level = 1
-                if g.kill_switch:
-                    p = tf.add_paragraph()
-                    p.text = f"Kill Switch: {g.kill_switch}"
-                    p.level = 1
-            
-            for insight in analysis.insights[:5]:
-                p = tf.add_paragraph()
-                p.text = f"• {insight.headline}"
-                p.level = 1
-            
-            # Insight slides
-            for insight in analysis.insights:
-                slide = prs.slides.add_slide(prs.slide_layouts[1])
-                title = slide.shapes.title
-                content = slide.placeholders[1]
-                
-                title.text = insight.headline
-                tf = content.text_frame
-                tf.text = insight.detail
-                
-                ev = insight.evidence
-                if isinstance(ev, NarrativeEvidence):
-                    p = tf.add_paragraph()
-                    p.text = f"Evidence ({ev.source_type}): {ev.reference}"
-                    p.level = 1
-                    if ev.speaker:
-                        p = tf.add_paragraph()
-                        p.text = f"Speaker: {ev.speaker}"
-                        p.level = 1
-                else:
-                    p = tf.add_paragraph()
-                    p.text = f"Metric: {ev.metric} = {ev.value}"
-                    p.level = 1
-                    if ev.delta is not None:
-                        p = tf.add_paragraph()
-                        p.text = f"Change: {ev.delta_percent:.1f}%"
-                        p.level = 1
-                
-                p = tf.add_paragraph()
-                p.text = f"Implication: {insight.implication}"
-                p.level = 1
-            
-            prs.save(file_path)
-            
-        except ImportError:
+        if not PPTX_AVAILABLE:
             # If python-pptx not available, create a placeholder
             with open(file_path.with_suffix('.txt'), 'w') as f:
                 f.write("PowerPoint generation requires python-pptx package.\n")
                 f.write("Install with: pip install python-pptx\n")
                 f.write(f"\nSee {file_path.with_suffix('.md')} for formatted output.")
+            return
+        
+        # Open the blank template from memory rather than locating and
+        # reading it from disk on every run
+        prs = Presentation(io.BytesIO(_pptx_template_bytes()))
+        prs.slide_width = _SLIDE_WIDTH_EMU
+        prs.slide_height = _SLIDE_HEIGHT_EMU
+        
+        _index_part_relationships(prs.part)
+        title_layout = prs.slide_layouts[0]
+        content_layout = prs.slide_layouts[1]
+        add_slide = prs.slides.add_slide
+        
+        # Title slide
+        slide = add_slide(title_layout)
+        slide.shapes.title.text = "Tragaldabas Analysis"
+        slide.placeholders[1].text = f"{domain.title()} Domain\n{period}"
+        
+        # Summary slide
+        self._add_content_slide(
+            add_slide, content_layout, "Executive Summary", "Key Findings:",
+            [f"• {insight.headline}" for insight in analysis.insights[:5]]
+        )
 
+        # The Genius Move slide (Alpha Strike)
+        if analysis.genius_insight and analysis.genius_insight.thesis:
+            g = analysis.genius_insight
+            bullets = []
+            if g.mechanism:
+                bullets.append(g.mechanism)
+            if g.estimated_upside:
+                bullets.append(f"Upside: {g.estimated_upside}")
+            if g.kill_switch:
+                bullets.append(f"Kill Switch: {g.kill_switch}")
+            self._add_content_slide(add_slide, content_layout, "The Genius Move", g.thesis, bullets)
+        
+        # Insight slides
+        for insight in analysis.insights:
+            bullets = []
+            ev = insight.evidence
+            if isinstance(ev, NarrativeEvidence):
+                bullets.append(f"Evidence ({ev.source_type}): {ev.reference}")
+                if ev.speaker:
+                    bullets.append(f"Speaker: {ev.speaker}")
+            else:
+                bullets.append(f"Metric: {ev.metric} = {ev.value}")
+                if ev.delta is not None:
+                    bullets.append(f"Change: {ev.delta_percent:.1f}%")
+            bullets.append(f"Implication: {insight.implication}")
+            self._add_content_slide(add_slide, content_layout, insight.headline, insight.detail, bullets)
+        
+        with _atomic_target(file_path) as tmp:
+            prs.save(str(tmp))
+    
+    def _add_content_slide(self, add_slide, layout, title: str, body: str, bullets: List[str]):
+        """Add a title-and-content slide with a body paragraph and level-1 bullets"""
+        slide = add_slide(layout)
+        slide.shapes.title.text = title
+        
+        # Build every paragraph as one XML fragment and splice it into the
+        # placeholder body, instead of going through a proxy per paragraph.
+        # Body lines are separate paragraphs; newlines inside a bullet stay
+        # line breaks within that bullet.
+        xml = "".join(
+            [_paragraph_xml(line) for line in body.split("\n")]
+            + [_paragraph_xml(bullet, level=1) for bullet in bullets]
+        )
+        fragment = parse_xml(f'<a:txBody xmlns:a="{_DRAWINGML_NS}">{xml}</a:txBody>')
+        tx_body = slide.placeholders[1].text_frame._txBody
+        for paragraph in tx_body.findall(qn("a:p")):
+            tx_body.remove(paragraph)
+        tx_body.extend(list(fragment))
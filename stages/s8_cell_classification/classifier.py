@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import re
+import zipfile
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
@@ -25,6 +31,47 @@ from core.models import (
     CellFormatting,
 )
 from core.enums import CellRole, InputType
+from utils.excel import column_letter
+
+
+# Sheet XML elements that only a full (non read-only) load exposes
+_SHEET_METADATA_MARKERS = (b"mergeCell", b"dataValidation", b"conditionalFormatting")
+
+# Text that reads as a heading: "Revenue:" or "Total ...", "Summary ...", "Subtotal ..."
+_STRUCTURAL_TEXT = re.compile(r":\Z|^(?:total|summary|subtotal)", re.IGNORECASE | re.ASCII)
+
+_REFERENCE_SUBTYPES = frozenset({"RANGE", "CELL", "NAMED_RANGE"})
+
+# Every reference contains a letter (column or name), a backslash-led name or
+# a row range like 2:2; formulas with none of these (=42+1) skip tokenizing
+_MAYBE_REFERENCE = re.compile(r"[^\W\d]|[\\:]")
+
+# Neighbouring roles that make a static text cell a label
+_LABEL_NEIGHBOR_ROLES = frozenset({CellRole.INPUT, CellRole.OUTPUT, CellRole.INTERMEDIATE})
+_LABELLED_ROLES = frozenset({CellRole.STRUCTURAL, CellRole.LABEL})
+
+
+@lru_cache(maxsize=4096)
+def _tokenize_formula(formula: str) -> Tuple[Tuple[str, str], ...]:
+    """Reference tokens of a formula as (subtype, value) pairs; copied formulas reuse them."""
+    return tuple(
+        (token.subtype, token.value.replace("$", ""))
+        for token in Tokenizer(formula).items
+        if token.subtype in _REFERENCE_SUBTYPES
+    )
+
+
+@dataclass(slots=True)
+class _CellRecord:
+    """Per-cell facts gathered while streaming a sheet, before classification"""
+    sheet: str
+    row: int
+    col: int
+    value: object = None
+    formula: Optional[str] = None
+    references: List[str] = field(default_factory=list)
+    input_type: InputType = InputType.TEXT
+    formatting: Optional[CellFormatting] = None
 
 
 class CellClassifier(Stage[str, CellClassificationResult]):
@@ -47,63 +94,119 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         return path.exists() and path.is_file()
 
     async def execute(self, input_data: str) -> CellClassificationResult:
-        workbook = load_workbook(input_data, data_only=False, keep_vba=True)
+        # Cells are streamed once from a read-only workbook. Merged ranges,
+        # validations, conditional formats, pivots and VBA are not exposed in
+        # read-only mode, so a full load is made only when the file has any.
+        workbook = load_workbook(input_data, read_only=True, data_only=False)
+        metadata_workbook = None
+        if self._has_sheet_metadata(input_data):
+            metadata_workbook = load_workbook(input_data, data_only=False, keep_vba=True)
+        try:
+            return self._classify(input_data, workbook, metadata_workbook)
+        finally:
+            workbook.close()
+            if metadata_workbook is not None and metadata_workbook.vba_archive:
+                metadata_workbook.vba_archive.close()
+
+    def _classify(
+        self, input_data: str, workbook, metadata_workbook
+    ) -> CellClassificationResult:
         named_ranges = self._extract_named_ranges(workbook)
-        vba_macros = self._extract_vba_macros(input_data, workbook)
+        named_map = {nr.name: nr.ref for nr in named_ranges}
+        vba_macros = self._extract_vba_macros(input_data, metadata_workbook)
 
         validation_map: Dict[str, DataValidation] = {}
+        # Many validations share one dropdown list; expand each list once
+        options_cache: Dict[Tuple[str, str, Optional[str]], List[str]] = {}
         sheets: List[SheetClassification] = []
         conditional_formats: List[ConditionalFormat] = []
         pivot_tables: List[PivotTableDefinition] = []
 
-        cell_data: Dict[str, Dict[str, object]] = {}
-        references_by_cell: Dict[str, Set[str]] = {}
+        cell_data: Dict[str, _CellRecord] = {}
+        references_by_cell: Dict[str, Set[str]] = defaultdict(set)
         merged_anchors: Dict[str, Set[Tuple[int, int]]] = {}
-        row_stats: Dict[str, Dict[int, Dict[str, int]]] = {}
+        # Per row: [non_empty, text, numeric] cell counts
+        row_stats: Dict[str, Dict[int, List[int]]] = {}
         row_max_non_empty: Dict[str, int] = {}
+        # Formatting depends only on the cell's style, which most cells share;
+        # read each style's font/fill once and reuse the CellFormatting
+        formatting_by_style: Dict[object, CellFormatting] = {}
 
         for sheet in workbook.worksheets:
             sheet_title = sheet.title
-            validation_map.update(self._extract_validations(workbook, sheet, sheet_title))
-            conditional_formats.extend(self._extract_conditional_formats(sheet, sheet_title))
-            merged_anchors[sheet_title] = self._extract_merged_anchors(sheet)
-            row_stats[sheet_title] = self._build_row_stats(sheet)
-            row_max_non_empty[sheet_title] = max(
-                (stats["non_empty"] for stats in row_stats[sheet_title].values()),
-                default=0,
-            )
-            pivot_tables.extend(self._extract_pivot_tables(sheet, sheet_title))
+            merged_anchors[sheet_title] = set()
+            if metadata_workbook is not None:
+                meta_sheet = metadata_workbook[sheet_title]
+                validation_map.update(
+                    self._extract_validations(
+                        metadata_workbook, meta_sheet, sheet_title, options_cache
+                    )
+                )
+                conditional_formats.extend(
+                    self._extract_conditional_formats(meta_sheet, sheet_title)
+                )
+                merged_anchors[sheet_title] = self._extract_merged_anchors(meta_sheet)
+                pivot_tables.extend(self._extract_pivot_tables(meta_sheet, sheet_title))
 
+            # Row statistics are gathered in the same pass as the cells
+            sheet_stats: Dict[int, List[int]] = {}
+            # Don't trust the stored dimensions; read every row in the sheet
+            sheet.reset_dimensions()
             for row in sheet.iter_rows():
                 for cell in row:
-                    if cell.value is None and cell.data_type != "f":
+                    value = cell.value
+                    data_type = cell.data_type
+                    if value is None and data_type != "f":
                         continue
 
-                    address = f"{sheet_title}!{cell.coordinate}"
-                    formula = self._normalize_formula(cell.value, cell.data_type)
+                    row_idx = cell.row
+                    col_idx = cell.column
+                    if value is not None and str(value).strip() != "":
+                        stats = sheet_stats.get(row_idx)
+                        if stats is None:
+                            stats = sheet_stats[row_idx] = [0, 0, 0]
+                        stats[0] += 1
+                        if isinstance(value, str):
+                            stats[1] += 1
+                        elif isinstance(value, (int, float)):
+                            stats[2] += 1
+
+                    # cell.coordinate rebuilds the column letters on every access
+                    address = f"{sheet_title}!{column_letter(col_idx)}{row_idx}"
+                    formula = self._normalize_formula(value, data_type)
                     references = []
                     if formula:
                         references = self._extract_references(
-                            formula, sheet_title, named_ranges
+                            formula, sheet_title, named_map
                         )
                         for ref in references:
                             for expanded in self._expand_reference(ref):
-                                references_by_cell.setdefault(expanded, set()).add(address)
+                                references_by_cell[expanded].add(address)
 
                     validation_rule = validation_map.get(address)
                     input_type = self._infer_input_type(cell)
                     if validation_rule:
                         input_type = self._input_type_from_validation(validation_rule) or input_type
-                    cell_data[address] = {
-                        "value": cell.value,
-                        "formula": formula,
-                        "references": references,
-                        "input_type": input_type,
-                        "formatting": self._extract_formatting(cell),
-                        "row": cell.row,
-                        "col": cell.column,
-                        "sheet": sheet_title,
-                    }
+                    style = cell.style_array
+                    formatting = formatting_by_style.get(style)
+                    if formatting is None:
+                        formatting = formatting_by_style[style] = self._extract_formatting(cell)
+                    cell_data[address] = _CellRecord(
+                        sheet=sheet_title,
+                        row=row_idx,
+                        col=col_idx,
+                        value=value,
+                        formula=formula,
+                        references=references,
+                        input_type=input_type,
+                        formatting=formatting,
+                    )
+
+            row_stats[sheet_title] = sheet_stats
+            row_max_non_empty[sheet_title] = max(
+                (stats[0] for stats in sheet_stats.values()),
+                default=0,
+            )
 
         # Ensure referenced cells exist even if empty in workbook
         for target_address in list(references_by_cell.keys()):
@@ -118,25 +221,18 @@ class CellClassifier(Stage[str, CellClassificationResult]):
                 except (ValueError, IndexError):
                     # Skip malformed references that can't be parsed
                     continue
-                cell_data[target_address] = {
-                    "value": None,
-                    "formula": None,
-                    "references": [],
-                    "input_type": InputType.TEXT,
-                    "formatting": None,
-                    "row": row,
-                    "col": col,
-                    "sheet": sheet_name,
-                }
+                cell_data[target_address] = _CellRecord(sheet=sheet_name, row=row, col=col)
 
         sheet_cells: Dict[str, List[ClassifiedCell]] = {}
         role_by_coord: Dict[str, Dict[Tuple[int, int], CellRole]] = {}
+        # (row, col) of every cell, so later passes don't re-parse addresses
+        coords: Dict[str, Tuple[int, int]] = {}
         structural_rows: Dict[str, List[Tuple[int, str]]] = {}
 
-        for address, payload in cell_data.items():
-            sheet_name, _ = address.split("!", 1)
+        for address, record in cell_data.items():
+            sheet_name = record.sheet
             referenced_by = sorted(references_by_cell.get(address, set()))
-            formula = payload.get("formula")
+            formula = record.formula
 
             if formula:
                 role = CellRole.INTERMEDIATE if referenced_by else CellRole.OUTPUT
@@ -145,45 +241,47 @@ class CellClassifier(Stage[str, CellClassificationResult]):
             else:
                 role = CellRole.STATIC
 
-            role_by_coord.setdefault(sheet_name, {})[(payload["row"], payload["col"])] = role
+            coord = (record.row, record.col)
+            coords[address] = coord
+            role_by_coord.setdefault(sheet_name, {})[coord] = role
 
             classified = ClassifiedCell(
                 address=address,
                 role=role,
-                input_type=payload.get("input_type"),
+                input_type=record.input_type,
                 formula=formula,
-                value=payload.get("value"),
+                value=record.value,
                 validation=validation_map.get(address),
-                formatting=payload.get("formatting"),
+                formatting=record.formatting,
                 referenced_by=referenced_by,
-                references=payload.get("references") or [],
+                references=record.references,
             )
 
             sheet_cells.setdefault(sheet_name, []).append(classified)
 
         for sheet_name, cells in sheet_cells.items():
             sheet_structural: List[Tuple[int, str]] = []
+            sheet_anchors = merged_anchors.get(sheet_name, set())
+            sheet_row_stats = row_stats.get(sheet_name, {})
+            max_non_empty = row_max_non_empty.get(sheet_name, 0)
             for cell in cells:
                 if cell.role != CellRole.STATIC:
                     continue
                 if not isinstance(cell.value, str) or not cell.value.strip():
                     continue
-                coord = self._parse_coordinate(cell.address)
-                if not coord:
-                    continue
+                coord = coords[cell.address]
 
                 if self._is_structural_cell(
-                    sheet_name,
                     coord,
                     cell,
-                    merged_anchors,
-                    row_stats,
-                    row_max_non_empty.get(sheet_name, 0),
+                    sheet_anchors,
+                    sheet_row_stats.get(coord[0]),
+                    max_non_empty,
                 ):
                     cell.role = CellRole.STRUCTURAL
                 elif self._is_label_cell(sheet_name, coord, role_by_coord):
                     cell.role = CellRole.LABEL
-                if cell.role in {CellRole.STRUCTURAL, CellRole.LABEL}:
+                if cell.role in _LABELLED_ROLES:
                     cell.label = str(cell.value).strip()
                 if cell.role == CellRole.STRUCTURAL:
                     sheet_structural.append((coord[0], cell.label or "Section"))
@@ -192,12 +290,13 @@ class CellClassifier(Stage[str, CellClassificationResult]):
             sheets.append(
                 SheetClassification(
                     name=sheet_name,
-                    cells=sorted(cells, key=lambda c: c.address),
-                    input_groups=self._build_groups(sheet_name, cells, structural_rows),
+                    # Row-major order; sorting the address strings put A10 before A2
+                    cells=sorted(cells, key=lambda c: coords[c.address]),
+                    input_groups=self._build_groups(sheet_name, cells, structural_rows, coords),
                     output_groups=self._build_groups(
-                        sheet_name, cells, structural_rows, role_filter=CellRole.OUTPUT
+                        sheet_name, cells, structural_rows, coords, role_filter=CellRole.OUTPUT
                     ),
-                    sections=self._build_sections(sheet_name, cells, structural_rows),
+                    sections=self._build_sections(sheet_name, cells, structural_rows, coords),
                 )
             )
 
@@ -210,6 +309,35 @@ class CellClassifier(Stage[str, CellClassificationResult]):
             pivot_tables=pivot_tables,
         )
 
+    def _has_sheet_metadata(self, file_path: str) -> bool:
+        """Check the raw package for parts that need a full workbook load"""
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                names = archive.namelist()
+                if any(
+                    name == "xl/vbaProject.bin" or name.startswith("xl/pivotTables/")
+                    for name in names
+                ):
+                    return True
+                for name in names:
+                    if not (name.startswith("xl/worksheets/") and name.endswith(".xml")):
+                        continue
+                    with archive.open(name) as part:
+                        tail = b""
+                        while True:
+                            chunk = part.read(1 << 20)
+                            if not chunk:
+                                break
+                            window = tail + chunk
+                            if any(marker in window for marker in _SHEET_METADATA_MARKERS):
+                                return True
+                            # Keep enough overlap to catch a marker split across chunks
+                            tail = window[-32:]
+        except (zipfile.BadZipFile, OSError, KeyError):
+            # Can't tell; fall back to the full load
+            return True
+        return False
+
     def _normalize_formula(self, value: object, data_type: Optional[str]) -> Optional[str]:
         if data_type != "f":
             return None
@@ -230,7 +358,11 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         return named_ranges
 
     def _extract_validations(
-        self, workbook, sheet, sheet_title: str
+        self,
+        workbook,
+        sheet,
+        sheet_title: str,
+        options_cache: Dict[Tuple[str, str, Optional[str]], List[str]],
     ) -> Dict[str, DataValidation]:
         validations: Dict[str, DataValidation] = {}
         if not sheet.data_validations:
@@ -239,7 +371,12 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         for validation in sheet.data_validations.dataValidation:
             rule_type = getattr(validation, "type", "") or ""
             formula1 = getattr(validation, "formula1", None)
-            options = self._parse_validation_options(workbook, sheet_title, rule_type, formula1)
+            cache_key = (sheet_title, rule_type, formula1)
+            options = options_cache.get(cache_key)
+            if options is None:
+                options = options_cache[cache_key] = self._parse_validation_options(
+                    workbook, sheet_title, rule_type, formula1
+                )
 
             for cell in validation.cells:
                 address = f"{sheet_title}!{cell}"
@@ -262,21 +399,22 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         self,
         formula: str,
         sheet_name: str,
-        named_ranges: List[NamedRange],
+        named_map: Dict[str, str],
     ) -> List[str]:
-        references: List[str] = []
-        named_map = {nr.name: nr.ref for nr in named_ranges}
+        if not _MAYBE_REFERENCE.search(formula):
+            return []
         try:
-            tokenizer = Tokenizer(formula)
-            for token in tokenizer.items:
-                if token.subtype in {"RANGE", "CELL", "NAMED_RANGE"}:
-                    value = token.value.replace("$", "")
-                    if token.subtype == "NAMED_RANGE" and value in named_map:
-                        references.append(self._normalize_reference(named_map[value], sheet_name))
-                    else:
-                        references.append(self._normalize_reference(value, sheet_name))
+            tokens = _tokenize_formula(formula)
         except Exception:
-            pass
+            return []
+
+        references: List[str] = []
+        normalize = self._normalize_reference
+        for subtype, value in tokens:
+            if subtype == "NAMED_RANGE" and value in named_map:
+                references.append(normalize(named_map[value], sheet_name))
+            else:
+                references.append(normalize(value, sheet_name))
 
         return [ref for ref in references if ref]
 
@@ -307,18 +445,15 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         if total > self.MAX_RANGE_EXPANSION:
             return [f"{sheet_name}!{address}"]
 
-        expanded = []
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                expanded.append(f"{sheet_name}!{self._col_letter(col)}{row}")
-        return expanded
-
-    def _col_letter(self, col_idx: int) -> str:
-        result = ""
-        while col_idx > 0:
-            col_idx, remainder = divmod(col_idx - 1, 26)
-            result = chr(65 + remainder) + result
-        return result
+        # Column prefixes are shared by every row of the range
+        prefixes = [
+            f"{sheet_name}!{column_letter(col)}" for col in range(min_col, max_col + 1)
+        ]
+        return [
+            f"{prefix}{row}"
+            for row in range(min_row, max_row + 1)
+            for prefix in prefixes
+        ]
 
     def _infer_input_type(self, cell) -> InputType:
         if cell.is_date:
@@ -445,6 +580,11 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         archive = getattr(workbook, "vba_archive", None)
         if not archive:
             return macros
+        # keep_vba copies every package part into vba_archive; only a VBA
+        # project part means the workbook actually carries macros
+        project_names = [name for name in archive.namelist() if name.endswith("vbaProject.bin")]
+        if not project_names:
+            return macros
         try:
             from oletools.olevba import VBA_Parser
         except Exception:
@@ -456,21 +596,26 @@ class CellClassifier(Stage[str, CellClassificationResult]):
             )
             return macros
 
-        parser = VBA_Parser(file_path)
-        try:
-            if not parser.detect_vba_macros():
-                return macros
-            for (_, _, filename, content) in parser.extract_macros():
-                if not content:
+        for project_name in project_names:
+            # Parse the OLE project already in memory rather than re-reading
+            # and unzipping the workbook from disk
+            parser = VBA_Parser(
+                project_name, data=archive.read(project_name), container=file_path
+            )
+            try:
+                if not parser.detect_vba_macros():
                     continue
-                macros.append(
-                    VBAMacro(
-                        name=str(filename),
-                        code=content,
+                for (_, _, filename, content) in parser.extract_macros():
+                    if not content:
+                        continue
+                    macros.append(
+                        VBAMacro(
+                            name=str(filename),
+                            code=content,
+                        )
                     )
-                )
-        finally:
-            parser.close()
+            finally:
+                parser.close()
         return macros
 
     def _parse_validation_options(
@@ -505,16 +650,19 @@ class CellClassifier(Stage[str, CellClassificationResult]):
             return []
         values: List[str] = []
         for row in target_sheet.iter_rows(
-            min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            values_only=True,
         ):
-            for cell in row:
-                if cell.value is None:
+            for cell_value in row:
+                if cell_value is None:
                     continue
-                value = str(cell.value).strip()
+                value = str(cell_value).strip()
                 if value:
                     values.append(value)
         return values
-        return []
 
     def _input_type_from_validation(self, validation: DataValidation) -> Optional[InputType]:
         if validation.validation_type == "list":
@@ -532,27 +680,27 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         sheet_name: str,
         cells: List[ClassifiedCell],
         structural_rows: Dict[str, List[Tuple[int, str]]],
+        coords: Dict[str, Tuple[int, int]],
     ) -> List[SheetSection]:
         sections: List[SheetSection] = []
-        if not structural_rows.get(sheet_name):
+        rows = structural_rows.get(sheet_name)
+        if not rows:
             return sections
-        row_to_section: Dict[int, str] = {}
-        for row_idx, label in structural_rows.get(sheet_name, []):
-            row_to_section[row_idx] = label
 
-        boundaries = self._section_boundaries(structural_rows.get(sheet_name, []))
+        section_starts = [row_idx for row_idx, _ in rows]
+        section_labels = [label for _, label in rows]
+        boundaries = self._section_boundaries(rows)
+        section_by_name: Dict[str, SheetSection] = {}
         for cell in cells:
-            coord = self._parse_coordinate(cell.address)
-            if not coord:
-                continue
-            section = self._find_section(sheet_name, coord, structural_rows)
+            coord = coords[cell.address]
+            section = self._find_section(coord, section_starts, section_labels)
             if not section:
                 continue
             if not self._coord_in_section(coord, section, boundaries):
                 continue
-            section_entry = next((s for s in sections if s.name == section), None)
+            section_entry = section_by_name.get(section)
             if not section_entry:
-                section_entry = SheetSection(name=section, cells=[])
+                section_entry = section_by_name[section] = SheetSection(name=section, cells=[])
                 sections.append(section_entry)
             section_entry.cells.append(cell.address)
         return sections
@@ -562,17 +710,19 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         sheet_name: str,
         cells: List[ClassifiedCell],
         structural_rows: Dict[str, List[Tuple[int, str]]],
+        coords: Dict[str, Tuple[int, int]],
         role_filter: CellRole = CellRole.INPUT,
     ) -> List[InputGroup | OutputGroup]:
         groups: Dict[str, List[str]] = {}
-        boundaries = self._section_boundaries(structural_rows.get(sheet_name, []))
+        rows = structural_rows.get(sheet_name, [])
+        section_starts = [row_idx for row_idx, _ in rows]
+        section_labels = [label for _, label in rows]
+        boundaries = self._section_boundaries(rows)
         for cell in cells:
             if cell.role != role_filter:
                 continue
-            coord = self._parse_coordinate(cell.address)
-            if not coord:
-                continue
-            section = self._find_section(sheet_name, coord, structural_rows) or "General"
+            coord = coords[cell.address]
+            section = self._find_section(coord, section_starts, section_labels) or "General"
             if section != "General" and not self._coord_in_section(coord, section, boundaries):
                 continue
             groups.setdefault(section, []).append(cell.address)
@@ -594,14 +744,16 @@ class CellClassifier(Stage[str, CellClassificationResult]):
 
     def _find_section(
         self,
-        sheet_name: str,
         coord: Tuple[int, int],
-        structural_rows: Dict[str, List[Tuple[int, str]]],
+        section_starts: List[int],
+        section_labels: List[str],
     ) -> Optional[str]:
-        row, _ = coord
-        for struct_row, label in reversed(structural_rows.get(sheet_name, [])):
-            if struct_row <= row and label:
-                return label
+        # section_starts is sorted; take the last structural row at or above coord
+        idx = bisect_right(section_starts, coord[0]) - 1
+        while idx >= 0:
+            if section_labels[idx]:
+                return section_labels[idx]
+            idx -= 1
         return None
 
     def _section_boundaries(
@@ -637,53 +789,19 @@ class CellClassifier(Stage[str, CellClassificationResult]):
             anchors.add((merged.min_row, merged.min_col))
         return anchors
 
-    def _build_row_stats(self, sheet) -> Dict[int, Dict[str, int]]:
-        counts: Dict[int, Dict[str, int]] = {}
-        for row in sheet.iter_rows():
-            non_empty = 0
-            text_count = 0
-            numeric_count = 0
-            row_idx = row[0].row if row else 0
-            for cell in row:
-                if cell.value is not None and str(cell.value).strip() != "":
-                    non_empty += 1
-                    if isinstance(cell.value, str):
-                        text_count += 1
-                    elif isinstance(cell.value, (int, float)):
-                        numeric_count += 1
-            counts[row_idx] = {
-                "non_empty": non_empty,
-                "text": text_count,
-                "numeric": numeric_count,
-            }
-        return counts
-
-    def _parse_coordinate(self, address: str) -> Optional[Tuple[int, int]]:
-        if "!" not in address:
-            return None
-        _, coord = address.split("!", 1)
-        try:
-            return coordinate_to_tuple(coord)
-        except ValueError:
-            return None
-
     def _is_structural_cell(
         self,
-        sheet_name: str,
         coord: Tuple[int, int],
         cell: ClassifiedCell,
-        merged_anchors: Dict[str, Set[Tuple[int, int]]],
-        row_stats: Dict[str, Dict[int, Dict[str, int]]],
+        merged_anchors: Set[Tuple[int, int]],
+        stats: Optional[List[int]],
         max_non_empty: int,
     ) -> bool:
-        if coord in merged_anchors.get(sheet_name, set()):
+        if coord in merged_anchors:
             return True
         if cell.formatting and cell.formatting.font_bold:
             return True
-        stats = row_stats.get(sheet_name, {}).get(coord[0], {})
-        non_empty = stats.get("non_empty", 0)
-        text_count = stats.get("text", 0)
-        numeric_count = stats.get("numeric", 0)
+        non_empty, text_count, numeric_count = stats or (0, 0, 0)
         if non_empty <= 1:
             return True
         if text_count >= 2 and numeric_count == 0:
@@ -693,11 +811,9 @@ class CellClassifier(Stage[str, CellClassificationResult]):
                 return True
         if isinstance(cell.value, str):
             value = cell.value.strip()
-            if value.endswith(":"):
-                return True
             if value.isupper() and len(value) >= 4:
                 return True
-            if value.lower().startswith(("total", "summary", "subtotal")):
+            if _STRUCTURAL_TEXT.search(value):
                 return True
         return False
 
@@ -707,14 +823,15 @@ class CellClassifier(Stage[str, CellClassificationResult]):
         coord: Tuple[int, int],
         role_by_coord: Dict[str, Dict[Tuple[int, int], CellRole]],
     ) -> bool:
-        neighbors = [
-            (coord[0], coord[1] - 1),
-            (coord[0], coord[1] + 1),
-            (coord[0] - 1, coord[1]),
-            (coord[0] + 1, coord[1]),
-        ]
+        sheet_roles = role_by_coord.get(sheet_name, {})
+        row, col = coord
+        neighbors = (
+            (row, col - 1),
+            (row, col + 1),
+            (row - 1, col),
+            (row + 1, col),
+        )
         for neighbor in neighbors:
-            role = role_by_coord.get(sheet_name, {}).get(neighbor)
-            if role in {CellRole.INPUT, CellRole.OUTPUT, CellRole.INTERMEDIATE}:
+            if sheet_roles.get(neighbor) in _LABEL_NEIGHBOR_ROLES:
                 return True
         return False
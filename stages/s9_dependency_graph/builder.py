@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from collections import deque
 import re
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from openpyxl.utils.cell import range_boundaries
@@ -18,6 +18,90 @@ from core.models import (
     CalculationCluster,
 )
 from core.enums import CellRole
+from utils.excel import column_letter
+
+
+# Formula functions that hint at what a cluster computes, in tie-break order;
+# "percentage" is scored by counting "%" signs instead
+_PURPOSE_GROUPS = {
+    "lookup": ("VLOOKUP", "XLOOKUP", "INDEX", "MATCH"),
+    "aggregation": ("SUM", "SUMIF", "SUMIFS", "AVERAGE", "COUNT", "COUNTIF"),
+    "conditional_logic": ("IF", "AND", "OR", "NOT", "IFERROR", "IFS", "SWITCH"),
+    "date_calculation": ("DATE", "TODAY", "NOW", "YEAR", "MONTH", "DAY", "DATEDIF", "EOMONTH"),
+    "financial_formula": ("NPV", "IRR", "PMT", "FV", "PV", "RATE"),
+    "percentage": (),
+    "rounding": ("ROUND", "ROUNDUP", "ROUNDDOWN"),
+    "text": ("CONCAT", "CONCATENATE", "LEFT", "RIGHT", "MID", "TEXT"),
+}
+_PURPOSE_BY_KEYWORD = {
+    keyword: group for group, keywords in _PURPOSE_GROUPS.items() for keyword in keywords
+}
+# Whole words only, so IFERROR is not also counted as IF and NPV as PV
+_PURPOSE_KEYWORDS = re.compile(
+    r"\b(" + "|".join(sorted(_PURPOSE_BY_KEYWORD, key=len, reverse=True)) + r")\b"
+)
+
+
+@lru_cache(maxsize=8192)
+def _expand_range(ref: str, max_expansion: int) -> Tuple[str, ...]:
+    """Cells of a sheet-qualified range; ranges repeated across formulas reuse them."""
+    sheet_name, address = ref.split("!", 1)
+    try:
+        min_col, min_row, max_col, max_row = range_boundaries(address)
+    except ValueError:
+        return ()
+
+    # Whole rows/columns and ranges too large to expand stay as one node
+    if None in (min_col, min_row, max_col, max_row):
+        return (ref,)
+
+    total = (max_row - min_row + 1) * (max_col - min_col + 1)
+    if total > max_expansion:
+        return (ref,)
+
+    # Column prefixes are shared by every row of the range
+    prefixes = [
+        f"{sheet_name}!{column_letter(col)}" for col in range(min_col, max_col + 1)
+    ]
+    if min_row == max_row:
+        row_label = str(min_row)
+        return tuple(prefix + row_label for prefix in prefixes)
+    return tuple(
+        f"{prefix}{row}"
+        for row in range(min_row, max_row + 1)
+        for prefix in prefixes
+    )
+
+
+class _UnionFind:
+    """Disjoint sets over 0..size-1 with union by rank and path compression"""
+
+    __slots__ = ("parent", "rank")
+
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, left: int, right: int) -> None:
+        left = self.find(left)
+        right = self.find(right)
+        if left == right:
+            return
+        rank = self.rank
+        if rank[left] < rank[right]:
+            left, right = right, left
+        self.parent[right] = left
+        if rank[left] == rank[right]:
+            rank[left] += 1
 
 
 class DependencyGraphBuilder(Stage[CellClassificationResult, DependencyGraph]):
@@ -51,8 +135,15 @@ class DependencyGraphBuilder(Stage[CellClassificationResult, DependencyGraph]):
                 if cell.label:
                     labels_by_cell[cell.address] = cell.label
 
+        # Every node gets an entry, in node order, so the topological sort
+        # sees roots without incoming edges in a stable order
+        adjacency: Dict[str, Set[str]] = {node: set() for node in nodes}
+        reverse_adjacency: Dict[str, Set[str]] = {node: set() for node in nodes}
+        in_degree: Dict[str, int] = dict.fromkeys(nodes, 0)
+
         for sheet in input_data.sheets:
             for cell in sheet.cells:
+                target = cell.address
                 for ref in cell.references:
                     for expanded in self._expand_reference(ref):
                         if expanded not in nodes:
@@ -60,33 +151,36 @@ class DependencyGraphBuilder(Stage[CellClassificationResult, DependencyGraph]):
                                 address=expanded,
                                 role=CellRole.INPUT,
                             )
-                        edges.append(Edge(source=expanded, target=cell.address))
-
-        adjacency: Dict[str, Set[str]] = {node: set() for node in nodes}
-        reverse_adjacency: Dict[str, Set[str]] = {node: set() for node in nodes}
-        in_degree: Dict[str, int] = {node: 0 for node in nodes}
-
-        for edge in edges:
-            adjacency[edge.source].add(edge.target)
-            reverse_adjacency[edge.target].add(edge.source)
-            in_degree[edge.target] += 1
-
-        execution_order = self._topological_sort(adjacency, in_degree)
+                            adjacency[expanded] = set()
+                            reverse_adjacency[expanded] = set()
+                            in_degree[expanded] = 0
+                        dependents = adjacency[expanded]
+                        # =A1+A1 or =SUM(A1:A3)+A2 name a parent twice; count
+                        # it once so Kahn's sort can still release the cell
+                        if target in dependents:
+                            continue
+                        dependents.add(target)
+                        reverse_adjacency[target].add(expanded)
+                        in_degree[target] += 1
+                        edges.append(Edge(source=expanded, target=target))
+
+        # Node degrees, depths and clusters are filled in by the passes
+        # below as they visit each node
+        execution_order = self._topological_sort(nodes, adjacency, in_degree)
         circular_refs = []
         if len(execution_order) < len(nodes):
-            remaining = [node for node in nodes if node not in execution_order]
+            ordered = set(execution_order)
+            remaining = []
+            for node_id, node in nodes.items():
+                if node_id in ordered:
+                    continue
+                remaining.append(node_id)
+                node.in_degree = in_degree[node_id]
+                node.out_degree = len(adjacency[node_id])
             circular_refs.append(CircularRef(cycle=remaining, ref_type="error"))
 
-        depth_map = self._compute_depths(adjacency, reverse_adjacency, execution_order)
-        clusters = self._compute_clusters(
-            nodes, adjacency, reverse_adjacency, labels_by_cell
-        )
-
-        for node_id, node in nodes.items():
-            node.in_degree = in_degree.get(node_id, 0)
-            node.out_degree = len(adjacency.get(node_id, set()))
-            node.depth = depth_map.get(node_id, 0)
-            node.cluster = self._find_cluster_id(node_id, clusters)
+        self._compute_depths(nodes, reverse_adjacency, execution_order)
+        clusters = self._compute_clusters(nodes, edges, labels_by_cell)
 
         return DependencyGraph(
             nodes=nodes,
@@ -97,53 +191,77 @@ class DependencyGraphBuilder(Stage[CellClassificationResult, DependencyGraph]):
         )
 
     def _topological_sort(
-        self, adjacency: Dict[str, Set[str]], in_degree: Dict[str, int]
+        self,
+        nodes: Dict[str, GraphNode],
+        adjacency: Dict[str, Set[str]],
+        in_degree: Dict[str, int],
     ) -> List[str]:
-        queue = deque([node for node, deg in in_degree.items() if deg == 0])
-        order: List[str] = []
-
-        while queue:
-            node = queue.popleft()
-            order.append(node)
-            for neighbor in adjacency.get(node, set()):
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+        # Kahn's algorithm; the order list doubles as the FIFO queue, with
+        # position marking the next node to release. Counts are decremented
+        # on a copy so each released node records its full in-degree.
+        pending = dict(in_degree)
+        order = [node for node, deg in pending.items() if deg == 0]
+        append = order.append
+        neighbors_of = adjacency.get
+        position = 0
+        while position < len(order):
+            node = order[position]
+            position += 1
+            neighbors = neighbors_of(node, ())
+            graph_node = nodes[node]
+            graph_node.in_degree = in_degree[node]
+            graph_node.out_degree = len(neighbors)
+            for neighbor in neighbors:
+                remaining = pending[neighbor] - 1
+                pending[neighbor] = remaining
+                if remaining == 0:
+                    append(neighbor)
 
         return order
 
     def _compute_depths(
         self,
-        adjacency: Dict[str, Set[str]],
+        nodes: Dict[str, GraphNode],
         reverse_adjacency: Dict[str, Set[str]],
         execution_order: List[str],
-    ) -> Dict[str, int]:
+    ) -> None:
+        # Nodes caught in a cycle are never ordered and keep depth 0
         depth_map: Dict[str, int] = {}
+        depth_of = depth_map.get
+        parents_of = reverse_adjacency.get
         for node in execution_order:
-            parents = reverse_adjacency.get(node, set())
+            parents = parents_of(node)
             if not parents:
                 depth_map[node] = 0
-            else:
-                depth_map[node] = max(depth_map.get(p, 0) for p in parents) + 1
-        return depth_map
+                continue
+            # Running max instead of max() over a generator for every node
+            deepest = 0
+            for parent in parents:
+                parent_depth = depth_of(parent, 0)
+                if parent_depth > deepest:
+                    deepest = parent_depth
+            depth_map[node] = nodes[node].depth = deepest + 1
 
     def _compute_clusters(
         self,
         nodes: Dict[str, GraphNode],
-        adjacency: Dict[str, Set[str]],
-        reverse_adjacency: Dict[str, Set[str]],
+        edges: List[Edge],
         labels_by_cell: Dict[str, str],
     ) -> List[CalculationCluster]:
-        clusters: List[CalculationCluster] = []
-        visited: Set[str] = set()
-        cluster_idx = 0
+        # Clusters are the weakly connected components of the graph
+        node_index = {node_id: idx for idx, node_id in enumerate(nodes)}
+        sets = _UnionFind(len(node_index))
+        for edge in edges:
+            sets.union(node_index[edge.source], node_index[edge.target])
 
-        for node_id in nodes:
-            if node_id in visited:
-                continue
-            component = self._collect_component(node_id, adjacency, reverse_adjacency)
-            visited.update(component)
+        # Components come out in order of their first node, as nodes are visited
+        components: Dict[int, List[str]] = {}
+        find = sets.find
+        for node_id, idx in node_index.items():
+            components.setdefault(find(idx), []).append(node_id)
 
+        clusters: List[CalculationCluster] = []
+        for cluster_idx, component in enumerate(components.values()):
             inputs = []
             outputs = []
             intermediates = []
@@ -157,48 +275,21 @@ class DependencyGraphBuilder(Stage[CellClassificationResult, DependencyGraph]):
                 else:
                     intermediates.append(member)
 
+            cluster_id = self._cluster_name(cluster_idx, labels_by_cell, outputs, inputs)
+            for member in component:
+                nodes[member].cluster = cluster_id
             clusters.append(
                 CalculationCluster(
-                    id=self._cluster_name(cluster_idx, labels_by_cell, outputs, inputs),
+                    id=cluster_id,
                     inputs=sorted(inputs),
                     outputs=sorted(outputs),
                     intermediates=sorted(intermediates),
                     semantic_purpose=self._infer_semantic_purpose(nodes, component),
                 )
             )
-            cluster_idx += 1
 
         return clusters
 
-    def _collect_component(
-        self,
-        start: str,
-        adjacency: Dict[str, Set[str]],
-        reverse_adjacency: Dict[str, Set[str]],
-    ) -> Set[str]:
-        stack = [start]
-        component: Set[str] = set()
-        while stack:
-            node = stack.pop()
-            if node in component:
-                continue
-            component.add(node)
-            stack.extend(adjacency.get(node, set()))
-            stack.extend(reverse_adjacency.get(node, set()))
-        return component
-
-    def _find_cluster_id(
-        self, node_id: str, clusters: List[CalculationCluster]
-    ) -> Optional[str]:
-        for cluster in clusters:
-            if (
-                node_id in cluster.inputs
-                or node_id in cluster.outputs
-                or node_id in cluster.intermediates
-            ):
-                return cluster.id
-        return None
-
     def _cluster_name(
         self,
         index: int,
@@ -216,64 +307,27 @@ class DependencyGraphBuilder(Stage[CellClassificationResult, DependencyGraph]):
         return f"cluster_{index}"
 
     def _infer_semantic_purpose(
-        self, nodes: Dict[str, GraphNode], component: Set[str]
+        self, nodes: Dict[str, GraphNode], component: Iterable[str]
     ) -> Optional[str]:
-        formulas = " ".join(
-            [nodes[node].formula or "" for node in component if node in nodes]
-        ).upper()
-        if not formulas.strip():
-            return None
-
-        keyword_groups = [
-            ("lookup", ["VLOOKUP", "XLOOKUP", "INDEX", "MATCH"]),
-            ("aggregation", ["SUM", "SUMIF", "SUMIFS", "AVERAGE", "COUNT", "COUNTIF"]),
-            ("conditional_logic", ["IF", "AND", "OR", "NOT", "IFERROR", "IFS", "SWITCH"]),
-            ("date_calculation", ["DATE", "TODAY", "NOW", "YEAR", "MONTH", "DAY", "DATEDIF", "EOMONTH"]),
-            ("financial_formula", ["NPV", "IRR", "PMT", "FV", "PV", "RATE"]),
-            ("percentage", ["%"]),
-            ("rounding", ["ROUND", "ROUNDUP", "ROUNDDOWN"]),
-            ("text", ["CONCAT", "CONCATENATE", "LEFT", "RIGHT", "MID", "TEXT"]),
-        ]
-
-        scores: Dict[str, int] = {name: 0 for name, _ in keyword_groups}
-        for name, tokens in keyword_groups:
-            for token in tokens:
-                if token == "%":
-                    scores[name] += formulas.count("%")
-                else:
-                    scores[name] += formulas.count(token)
+        scores: Dict[str, int] = dict.fromkeys(_PURPOSE_GROUPS, 0)
+        # Scan formula by formula rather than joining the whole component
+        for node in component:
+            graph_node = nodes.get(node)
+            formula = graph_node.formula if graph_node else None
+            if not formula:
+                continue
+            formula = formula.upper()
+            for keyword in _PURPOSE_KEYWORDS.findall(formula):
+                scores[_PURPOSE_BY_KEYWORD[keyword]] += 1
+            scores["percentage"] += formula.count("%")
 
         top = max(scores.items(), key=lambda item: item[1])
         return top[0] if top[1] > 0 else None
 
     def _expand_reference(self, ref: str) -> Iterable[str]:
         if "!" not in ref:
-            return []
-        sheet_name, address = ref.split("!", 1)
-        if ":" not in address:
-            return [f"{sheet_name}!{address}"]
-
-        try:
-            min_col, min_row, max_col, max_row = range_boundaries(address)
-        except ValueError:
-            return []
-
-        if None in (min_col, min_row, max_col, max_row):
-            return [f"{sheet_name}!{address}"]
-
-        total = (max_row - min_row + 1) * (max_col - min_col + 1)
-        if total > self.MAX_RANGE_EXPANSION:
-            return [f"{sheet_name}!{address}"]
-
-        expanded = []
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                expanded.append(f"{sheet_name}!{self._col_letter(col)}{row}")
-        return expanded
-
-    def _col_letter(self, col_idx: int) -> str:
-        result = ""
-        while col_idx > 0:
-            col_idx, remainder = divmod(col_idx - 1, 26)
-            result = chr(65 + remainder) + result
-        return result
+            return ()
+        # Sheet names cannot contain ":", so this is a single cell reference
+        if ":" not in ref:
+            return (ref,)
+        return _expand_range(ref, self.MAX_RANGE_EXPANSION)
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pytest
@@ -5,10 +6,22 @@ from openpyxl import Workbook
 from openpyxl.formatting.rule import FormulaRule
 from openpyxl.styles import Font
 
+from config import settings
 from stages.s8_cell_classification import CellClassifier
 from stages.s9_dependency_graph import DependencyGraphBuilder
 from stages.s10_logic_extraction import LogicExtractor
-from core.models import DependencyGraph, GraphNode
+from stages.s11_code_generation.generator import CodeGenerator
+from stages.s12_scaffold_deploy.scaffolder import Scaffolder
+from core.exceptions import StageError
+from core.models import (
+    CellClassificationResult,
+    ClassifiedCell,
+    DependencyGraph,
+    GeneratedProject,
+    GraphNode,
+    LogicExtractionResult,
+    SheetClassification,
+)
 from core.enums import CellRole
 
 
@@ -146,3 +159,167 @@ async def test_logic_extractor_flags_unsupported():
     result = await extractor.execute(graph)
 
     assert result.unsupported_features
+
+
+def _classification(*cells: ClassifiedCell) -> CellClassificationResult:
+    return CellClassificationResult(
+        sheets=[SheetClassification(name="Sheet1", cells=list(cells))]
+    )
+
+
+@pytest.mark.asyncio
+async def test_cell_classification_orders_cells_row_major(tmp_path: Path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Sheet1"
+    for row in (1, 2, 10):
+        sheet[f"A{row}"] = row
+        sheet[f"B{row}"] = row
+
+    file_path = tmp_path / "order.xlsx"
+    workbook.save(file_path)
+
+    result = await CellClassifier().execute(str(file_path))
+
+    assert [cell.address for cell in result.sheets[0].cells] == [
+        "Sheet1!A1", "Sheet1!B1", "Sheet1!A2", "Sheet1!B2", "Sheet1!A10", "Sheet1!B10",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dependency_graph_counts_repeated_parents_once():
+    classification = _classification(
+        ClassifiedCell(address="Sheet1!A1", role=CellRole.INPUT),
+        ClassifiedCell(address="Sheet1!A2", role=CellRole.INPUT),
+        ClassifiedCell(address="Sheet1!A3", role=CellRole.INPUT),
+        ClassifiedCell(
+            address="Sheet1!B1", role=CellRole.INTERMEDIATE,
+            formula="=A1+A1", references=["Sheet1!A1", "Sheet1!A1"],
+        ),
+        ClassifiedCell(
+            address="Sheet1!B2", role=CellRole.OUTPUT,
+            formula="=SUM(A1:A3)+A2", references=["Sheet1!A1:A3", "Sheet1!A2"],
+        ),
+        ClassifiedCell(
+            address="Sheet1!B3", role=CellRole.OUTPUT,
+            formula="=B1*2", references=["Sheet1!B1"],
+        ),
+    )
+
+    graph = await DependencyGraphBuilder().execute(classification)
+
+    assert graph.circular_refs == []
+    assert graph.execution_order.index("Sheet1!B1") < graph.execution_order.index("Sheet1!B3")
+    assert graph.nodes["Sheet1!A1"].in_degree == 0
+    assert graph.nodes["Sheet1!B1"].in_degree == 1
+    assert graph.nodes["Sheet1!B2"].in_degree == 3
+    assert graph.nodes["Sheet1!A1"].out_degree == 2
+    assert len(graph.edges) == 5
+
+
+@pytest.mark.asyncio
+async def test_dependency_graph_reports_real_cycles():
+    classification = _classification(
+        ClassifiedCell(
+            address="Sheet1!A1", role=CellRole.INTERMEDIATE,
+            formula="=B1+1", references=["Sheet1!B1"],
+        ),
+        ClassifiedCell(
+            address="Sheet1!B1", role=CellRole.INTERMEDIATE,
+            formula="=A1+1", references=["Sheet1!A1"],
+        ),
+    )
+
+    graph = await DependencyGraphBuilder().execute(classification)
+
+    assert [ref.cycle for ref in graph.circular_refs] == [["Sheet1!A1", "Sheet1!B1"]]
+    assert graph.nodes["Sheet1!A1"].in_degree == 1
+
+
+def test_semantic_purpose_matches_whole_function_names():
+    builder = DependencyGraphBuilder()
+
+    def purpose(formula: str):
+        node = GraphNode(address="Sheet1!A1", role=CellRole.OUTPUT, formula=formula)
+        return builder._infer_semantic_purpose({node.address: node}, [node.address])
+
+    # IFERROR and IFS are not also counted as IF, NPV not as PV
+    assert purpose("=IFERROR(NPV(A1,B1:B5),0)") == "conditional_logic"
+    assert purpose("=NPV(A1,B1:B5)+PV(A1,2,3)") == "financial_formula"
+    assert purpose("=SUMIFS(A1:A5,B1:B5,1)") == "aggregation"
+    assert purpose("=A1*10%") == "percentage"
+    assert purpose("=A1+1") is None
+    assert purpose("") is None
+
+
+def test_formula_translation_operators():
+    generator = CodeGenerator()
+
+    assert generator._translate_formula("=IF(A1<>B1,1,0)", "Sheet1!D1") == (
+        'ifFunc(getValue("Sheet1!A1", inputs)!=getValue("Sheet1!B1", inputs),1,0)'
+    )
+    assert generator._translate_formula("=A1*10%", "Sheet1!D1") == (
+        'getValue("Sheet1!A1", inputs)*(10/100)'
+    )
+    assert generator._translate_formula('=A1^2&"x"', "Sheet1!D1") == (
+        'getValue("Sheet1!A1", inputs)**2+"x"'
+    )
+
+
+def test_formula_translation_leaves_strings_and_function_names_alone():
+    generator = CodeGenerator()
+
+    # Operators and separators inside string literals are not translated
+    assert generator._translate_formula('=IF(A1<>B1,"a<>b;c",0)', "Sheet1!D1") == (
+        'ifFunc(getValue("Sheet1!A1", inputs)!=getValue("Sheet1!B1", inputs),"a<>b;c",0)'
+    )
+    # Function names that look like cells are not references
+    assert generator._translate_formula("=LOG10(C1);1", "Sheet1!D1") == (
+        'LOG10(getValue("Sheet1!C1", inputs)),1'
+    )
+
+
+def test_overview_kpis_rank_outputs_by_in_degree_and_depth():
+    graph = DependencyGraph(
+        nodes={
+            "Sheet1!C1": GraphNode(address="Sheet1!C1", role=CellRole.OUTPUT, in_degree=1),
+            "Sheet1!C2": GraphNode(address="Sheet1!C2", role=CellRole.OUTPUT, in_degree=4, depth=1),
+            "Sheet1!C3": GraphNode(address="Sheet1!C3", role=CellRole.OUTPUT, in_degree=2),
+        }
+    )
+    outputs = [
+        {"address": address, "label": address, "sheet": "Sheet1"}
+        for address in ("Sheet1!C1", "Sheet1!C2", "Sheet1!C3")
+    ]
+
+    module = CodeGenerator()._ui_designer_module(
+        CellClassificationResult(), [], outputs, LogicExtractionResult(), graph
+    )
+    layout_json = module.split("dashboardLayout: DashboardLayout = ", 1)[1].split(" as const;", 1)[0]
+    kpis = json.loads(layout_json)["overviewKpis"]
+
+    assert [kpi["address"] for kpi in kpis] == ["Sheet1!C2", "Sheet1!C3", "Sheet1!C1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rel_path", ["../escape.txt", "a/../../escape.txt", ".", "a/.."])
+async def test_scaffolder_rejects_paths_outside_project(tmp_path: Path, monkeypatch, rel_path: str):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    project = GeneratedProject(files={"package.json": "{}", rel_path: "x"})
+
+    with pytest.raises(StageError, match="Path traversal detected"):
+        await Scaffolder().execute(project)
+
+    assert not (tmp_path / "generated-apps" / "escape.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_scaffolder_writes_nested_files(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    project = GeneratedProject(files={"src/lib/a.ts": "export {};", "src/../README.md": "hi"})
+
+    result = await Scaffolder().execute(project)
+
+    project_dir = Path(result.project_path)
+    assert (project_dir / "src" / "lib" / "a.ts").read_text() == "export {};"
+    assert (project_dir / "README.md").read_text() == "hi"
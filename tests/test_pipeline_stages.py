@@ -0,0 +1,309 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import settings
+from stages.s2_structure.inferrer import StructureInferrer
+from stages.s3_archaeology.archaeologist import Archaeologist
+from stages.s5_etl import etl_manager
+from stages.s5_etl.etl_manager import ETLManager
+from stages.s7_output.output_manager import OutputManager, _md
+from llm.prompts import ArchaeologyPrompt, StructurePrompt
+from utils import llm_cache
+from core.exceptions import StageError
+from core.models import (
+    AnalysisResult,
+    ArchaeologyMap,
+    ETLResult,
+    Evidence,
+    FileMetadata,
+    Insight,
+    PostgresColumn,
+    PostgresTable,
+    ReceptionResult,
+    SheetPreview,
+    ValidationIssuesFrame,
+)
+from core.enums import Domain, FileType, Severity, ValidationIssueType, VisualizationType
+
+
+class FakeLLM:
+    """Stands in for LLMClient, replaying canned responses in order"""
+    
+    def __init__(self, *responses: str):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    def model_signature(self) -> str:
+        return "fake:model"
+    
+    async def complete(self, prompt, **kwargs) -> str:
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+class FakePreview:
+    def __init__(self, sheet_name: str):
+        self.sheet_name = sheet_name
+
+
+class FailingLLM:
+    """First call hangs until cancelled; the second raises StageError"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = False
+    
+    def model_signature(self) -> str:
+        return "fake:model"
+    
+    async def complete(self, prompt, **kwargs) -> str:
+        self.calls += 1
+        if self.calls > 1:
+            raise StageError(3, "LLM request failed")
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "{}"
+
+
+def _reception(*sheet_names: str) -> ReceptionResult:
+    df = pd.DataFrame([["name", "amount"], ["a", 1]])
+    return ReceptionResult(
+        metadata=FileMetadata(
+            file_path="book.xlsx", file_name="book.xlsx",
+            file_type=FileType.EXCEL_XLSX, file_size_bytes=0,
+        ),
+        previews=[
+            SheetPreview(
+                sheet_name=name, row_count=2, col_count=2,
+                preview_rows=[], column_letters=["A", "B"],
+            )
+            for name in sheet_names
+        ],
+        raw_data={name: df for name in sheet_names},
+    )
+
+
+def _archaeologist() -> Archaeologist:
+    # The snapshot and extraction helpers never touch the LLM client
+    return Archaeologist.__new__(Archaeologist)
+
+
+def test_markdown_escaping():
+    assert _md("a*b_c `d` #e |f| <script>") == r"a\*b\_c \`d\` \#e \|f\| &lt;script>"
+    assert _md("C:\\path") == "C:\\\\path"
+    assert _md("") == ""
+    assert _md(None) == ""
+
+
+@pytest.mark.asyncio
+async def test_markdown_report_escapes_llm_text(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    insight = Insight(
+        id="i1",
+        headline="Revenue | *up*",
+        detail="Driven by <b>Q4</b>",
+        evidence=Evidence(metric="revenue", value=10.0),
+        implication="# not a heading",
+        severity=Severity.INFO,
+        visualization_hint=VisualizationType.NONE,
+    )
+
+    result = await OutputManager().execute(
+        AnalysisResult(domain=Domain.FINANCIAL, insights=[insight])
+    )
+
+    report = Path(result.markdown_file_path).read_text()
+    assert r"Revenue \| \*up\*" in report
+    assert "Driven by &lt;b>Q4&lt;/b>" in report
+    assert r"\# not a heading" in report
+
+
+def test_snapshot_widths_ignore_blank_cells():
+    df = pd.DataFrame({0: ["abcd", "x"], 1: [np.nan, np.nan]})
+
+    snapshot = _archaeologist()._build_snapshot(df)
+    lines = snapshot.splitlines()
+
+    assert "nan" not in snapshot
+    # Blank column stays as wide as its letter; text column fits "abcd"
+    assert lines[0] == "ROW  │ " + "A".center(4) + " │ B"
+    assert any(line.endswith("abcd │  ") for line in lines)
+
+
+def test_extract_clean_data_clamps_range_past_end():
+    df = pd.DataFrame([["name", "amount"], ["a", 1], ["b", 2]])
+    arch_map = ArchaeologyMap(
+        sheet_name="Sheet1", header_row=1, data_start_row=2, data_end_row=50,
+    )
+
+    clean = _archaeologist()._extract_clean_data(df, arch_map)
+
+    assert list(clean.columns) == ["name", "amount"]
+    assert clean["name"].tolist() == ["a", "b"]
+
+
+def test_extract_clean_data_empty_when_start_past_end():
+    df = pd.DataFrame([["name", "amount"], ["a", 1]])
+    arch_map = ArchaeologyMap(
+        sheet_name="Sheet1", header_row=1, data_start_row=10, data_end_row=5,
+    )
+
+    clean = _archaeologist()._extract_clean_data(df, arch_map)
+
+    assert len(clean) == 0
+
+
+def test_validate_data_reports_nulls_in_non_nullable_columns():
+    df = pd.DataFrame(
+        {"id": [1, None, 3], "name": [None, None, "c"], "note": [None, None, None]},
+        index=[10, 11, 12],
+    )
+    schema = PostgresTable(
+        table_name="t",
+        columns=[
+            PostgresColumn(name="id", pg_type="INTEGER", nullable=False),
+            PostgresColumn(name="name", pg_type="TEXT", nullable=False),
+            PostgresColumn(name="note", pg_type="TEXT"),
+        ],
+    )
+
+    issues = ETLManager()._validate_data(df, schema)
+
+    assert isinstance(issues, ValidationIssuesFrame)
+    assert [(issue.row_number, issue.column) for issue in issues] == [
+        (10, "name"), (11, "id"), (11, "name"),
+    ]
+    assert {issue.issue_type for issue in issues} == {ValidationIssueType.NULL_VIOLATION}
+    assert issues[1].message == "Null value in non-nullable column"
+
+    result = ETLResult(table_schema=schema, issues_frame=issues)
+    assert len(result.validation_issues) == 3
+    assert "issues_frame" not in result.model_dump()
+
+
+def test_empty_validation_issues_frame():
+    frame = ValidationIssuesFrame()
+
+    assert len(frame) == 0
+    assert list(frame) == []
+    assert ETLResult(table_schema=PostgresTable(table_name="t")).validation_issues == []
+
+
+def _copy_csv_rows(path: Path) -> list[list]:
+    """Read a data file the way COPY ... WITH CSV HEADER sees its fields"""
+    lines = path.read_text().splitlines()[1:]
+    # Unquoted empty fields are NULL; a quoted "" is an empty string
+    return [
+        [None if field == "" else field.strip('"') for field in line.split(",")]
+        for line in lines
+    ]
+
+
+@pytest.mark.parametrize("writer", ["pandas", "pyarrow"])
+def test_write_csv_values_seen_by_copy(tmp_path: Path, monkeypatch, writer: str):
+    if writer == "pyarrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(etl_manager, "PYARROW_AVAILABLE", False)
+    df = pd.DataFrame({
+        "flag": [True, False],
+        "amount": [1.0, np.nan],
+        "ratio": [2.5, 0.25],
+        "seen_at": pd.to_datetime(["2024-01-02 03:04:05", None]),
+        "note": ["", "x"],
+        "_source_sheet": pd.Categorical(["Sheet1", "Sheet1"]),
+    })
+    path = tmp_path / "data.csv"
+
+    ETLManager()._write_csv(df, path)
+
+    assert path.read_text().splitlines()[0].replace('"', "") == (
+        "flag,amount,ratio,seen_at,note,_source_sheet"
+    )
+    rows = _copy_csv_rows(path)
+    assert [row[0].lower() for row in rows] == ["true", "false"]
+    assert [None if v is None else float(v) for v in (row[1] for row in rows)] == [1.0, None]
+    assert [float(row[2]) for row in rows] == [2.5, 0.25]
+    assert [None if row[3] is None else pd.Timestamp(row[3]) for row in rows] == [
+        pd.Timestamp("2024-01-02 03:04:05"), None,
+    ]
+    # Empty strings keep loading as NULL, whichever writer ran
+    assert [row[4] for row in rows] == [None, "x"]
+    assert [row[5] for row in rows] == ["Sheet1", "Sheet1"]
+
+
+@pytest.mark.asyncio
+async def test_archaeology_replaces_unparseable_cache_entry(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    archaeologist = _archaeologist()
+    archaeologist.prompt_builder = ArchaeologyPrompt()
+    archaeologist.llm = FakeLLM('{"header_row": 1, "data_start_row": 2}')
+    df = pd.DataFrame([["name", "amount"], ["a", 1]])
+    cache_key = llm_cache.make_key(
+        ArchaeologyPrompt.PROMPT_VERSION, "fake:model", archaeologist._build_snapshot(df)
+    )
+    llm_cache.put(cache_key, "not json")
+
+    arch_map, clean = await archaeologist._process_sheet(
+        FakePreview("Sheet1"), df, asyncio.Semaphore(1)
+    )
+
+    assert archaeologist.llm.calls == 1
+    assert arch_map.header_row == 1
+    assert clean["name"].tolist() == ["a"]
+    assert llm_cache.get(cache_key) == '{"header_row": 1, "data_start_row": 2}'
+
+    # A second run is served from the repaired entry
+    await archaeologist._process_sheet(FakePreview("Sheet1"), df, asyncio.Semaphore(1))
+    assert archaeologist.llm.calls == 1
+
+
+def test_disabled_cache_never_opens_database(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+
+    llm_cache.put("key", "response")
+    llm_cache.delete("key")
+
+    assert llm_cache.get("key") is None
+    assert not (tmp_path / "cache" / llm_cache.CACHE_FILE_NAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_structure_inference_cancels_sibling_sheets_on_failure(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_CONCURRENCY", 4)
+    inferrer = StructureInferrer.__new__(StructureInferrer)
+    inferrer.prompt_builder = StructurePrompt()
+    inferrer.llm = FailingLLM()
+
+    with pytest.raises(StageError, match="LLM request failed") as excinfo:
+        await asyncio.wait_for(inferrer.execute(_reception("Slow", "Bad")), timeout=5)
+
+    assert inferrer.llm.cancelled
+    assert excinfo.value.__suppress_context__
+
+
+@pytest.mark.asyncio
+async def test_archaeology_cancels_sibling_sheets_on_failure(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    archaeologist = _archaeologist()
+    archaeologist.prompt_builder = ArchaeologyPrompt()
+    archaeologist.llm = FailingLLM()
+
+    with pytest.raises(StageError, match="LLM request failed") as excinfo:
+        await asyncio.wait_for(
+            archaeologist.execute({"reception": _reception("Slow", "Bad"), "structure": None}),
+            timeout=5,
+        )
+
+    assert archaeologist.llm.cancelled
+    assert excinfo.value.__suppress_context__
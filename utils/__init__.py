@@ -1,12 +1,17 @@
 """Utility modules"""
 
 from .encoding import detect_encoding
-from .fuzzy import fuzzy_match_column
+from .excel import COLUMN_LETTERS, column_index, column_letter
+from .fuzzy import fuzzy_match_column, fuzzy_match_columns
 from .synonyms import normalize_column_name, COLUMN_SYNONYMS
 
 __all__ = [
     "detect_encoding",
+    "COLUMN_LETTERS",
+    "column_index",
+    "column_letter",
     "fuzzy_match_column",
+    "fuzzy_match_columns",
     "normalize_column_name",
     "COLUMN_SYNONYMS",
 ]
@@ -0,0 +1,62 @@
+"""Excel addressing utilities"""
+
+from typing import Dict, Tuple
+
+
+# Widest column reachable by the A-ZZZ references the formula parsers accept.
+MAX_COLUMN_INDEX = 18278
+
+
+def _compute_column_letter(col_idx: int) -> str:
+    result = ""
+    while col_idx > 0:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        result = chr(65 + remainder) + result
+    return result
+
+
+# Index 0 is the empty string so COLUMN_LETTERS[col_idx] works with 1-based columns.
+COLUMN_LETTERS: Tuple[str, ...] = tuple(
+    _compute_column_letter(col_idx) for col_idx in range(MAX_COLUMN_INDEX + 1)
+)
+
+COLUMN_INDEXES: Dict[str, int] = {
+    letters: col_idx for col_idx, letters in enumerate(COLUMN_LETTERS) if letters
+}
+
+
+def column_letter(col_idx: int) -> str:
+    """
+    Convert a 1-based column index to its Excel letters (1 -> "A", 28 -> "AB")
+
+    Args:
+        col_idx: 1-based column index
+
+    Returns:
+        Column letters, or an empty string for indexes below 1
+    """
+    if 0 <= col_idx <= MAX_COLUMN_INDEX:
+        return COLUMN_LETTERS[col_idx]
+    return _compute_column_letter(col_idx)
+
+
+def column_index(letters: str) -> int:
+    """
+    Convert Excel column letters to a 1-based column index ("A" -> 1, "ab" -> 28)
+
+    Args:
+        letters: Column letters, case-insensitive
+
+    Returns:
+        1-based column index, or 0 if the letters are not a valid column
+    """
+    letters = letters.strip().upper()
+    col_idx = COLUMN_INDEXES.get(letters)
+    if col_idx is not None:
+        return col_idx
+    if not letters or not letters.isascii() or not letters.isalpha():
+        return 0
+    col_idx = 0
+    for char in letters:
+        col_idx = col_idx * 26 + (ord(char) - 64)
+    return col_idx
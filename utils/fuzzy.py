@@ -4,6 +4,7 @@ from typing import Dict, List, Optional
 from config import settings
 
 try:
+    import numpy as np
     from rapidfuzz import fuzz, process
     RAPIDFUZZ_AVAILABLE = True
 except ImportError:
@@ -49,6 +50,59 @@ def fuzzy_match_column(
     return best_match
 
 
+def fuzzy_match_columns(
+    column_names: List[str],
+    synonym_dict: Dict[str, List[str]],
+    threshold: Optional[int] = None
+) -> List[Optional[str]]:
+    """
+    Fuzzy match many column names against a synonym dictionary at once
+    
+    Same result as calling fuzzy_match_column for each name, but all fuzzy
+    scores come from a single rapidfuzz cdist call.
+    
+    Args:
+        column_names: Column names to match
+        synonym_dict: Dictionary of canonical -> synonyms
+        threshold: Match threshold (0-100), defaults to config
+        
+    Returns:
+        Canonical name (or None) for each column name, in order
+    """
+    if not RAPIDFUZZ_AVAILABLE or not column_names:
+        return [None] * len(column_names)
+    
+    threshold = threshold or settings.FUZZY_MATCH_THRESHOLD
+    
+    # Exact matches win, with the first canonical in dict order taking precedence
+    exact: Dict[str, str] = {}
+    synonyms: List[str] = []
+    synonym_owners: List[str] = []
+    for canonical, canonical_synonyms in synonym_dict.items():
+        exact.setdefault(canonical, canonical)
+        for synonym in canonical_synonyms:
+            exact.setdefault(synonym, canonical)
+            synonyms.append(synonym)
+            synonym_owners.append(canonical)
+    
+    unmatched = list(dict.fromkeys(name for name in column_names if name not in exact))
+    fuzzy: Dict[str, Optional[str]] = {}
+    if unmatched and synonyms:
+        scores = process.cdist(
+            unmatched, synonyms, scorer=fuzz.ratio, dtype=np.float64, workers=-1
+        )
+        # argmax returns the first best synonym, matching the sequential scan
+        best = scores.argmax(axis=1)
+        for name, row, best_idx in zip(unmatched, scores, best):
+            score = row[best_idx]
+            fuzzy[name] = synonym_owners[best_idx] if score > 0 and score >= threshold else None
+    
+    return [
+        exact[name] if name in exact else fuzzy.get(name)
+        for name in column_names
+    ]
+
+
 def fuzzy_match_string(
     text: str,
     candidates: List[str],
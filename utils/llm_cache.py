@@ -0,0 +1,113 @@
+"""Content-addressed on-disk cache for LLM responses"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional
+
+from config import settings
+
+
+CACHE_FILE_NAME = "llm_responses.sqlite3"
+
+
+def _cache_path() -> Path:
+    return settings.get_output_path("cache") / CACHE_FILE_NAME
+
+
+def _connect() -> sqlite3.Connection:
+    # A short-lived connection per call keeps this safe to use from worker
+    # threads and concurrent coroutines without sharing sqlite handles.
+    conn = sqlite3.connect(_cache_path(), timeout=5.0)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+    )
+    return conn
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Build a cache key from prompt version and prompt inputs
+
+    Args:
+        parts: Values that fully determine the LLM response
+
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        # Separator so ("ab", "c") and ("a", "bc") hash differently
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """
+    Look up a cached LLM response
+
+    Args:
+        key: Cache key from make_key
+
+    Returns:
+        Cached response text, or None on a miss or when caching is disabled
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        # The cache is an optimization only; never fail a stage over it
+        return None
+    return row[0] if row else None
+
+
+def put(key: str, response: str) -> None:
+    """
+    Store an LLM response
+
+    Args:
+        key: Cache key from make_key
+        response: Raw response text
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                    (key, response),
+                )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def delete(key: str) -> None:
+    """
+    Drop a cached LLM response, e.g. one that no longer parses
+
+    Args:
+        key: Cache key from make_key
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass
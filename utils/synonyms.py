@@ -1,5 +1,6 @@
 """Column name synonym dictionary and normalization"""
 
+from functools import lru_cache
 from typing import Dict, List
 from config import settings
 
@@ -26,6 +27,8 @@ COLUMN_SYNONYMS: Dict[str, List[str]] = {
 }
 
 
+# Sheets tend to repeat the same headers, so memoize the string and fuzzy work
+@lru_cache(maxsize=8192)
 def normalize_column_name(raw_name: str) -> str:
     """
     Normalize a single column name: